@@ -10,37 +10,20 @@ the paper.
 
 Braiding generators are computed by fibonacci_2q6a.py
 """
-import pickle
 import numpy as np
-from braid_matrix_calculator import error_distance, get_matrix, leakage_error
+from braid_matrix_calculator import (
+    error_distance,
+    get_submatrix,
+    leakage_error,
+)
 from transformer import uncouple, time_mirror, uncouple_all
-import braiding_generators.fib_multi_qudits as multi_q
+from braiding_generators.generator_cache import get_generators
 from cplot import cplot, scale
+from braiding_generators.basis_index import BasisIndex
 
 
 # Calculate sigmas of 3 qubits 12 anyons
-try:
-    with open("bin/basis-3q-12a.pickle", "rb") as file:
-        basis = pickle.load(file)
-
-    with open("bin/SIG-3q-12a.pickle", "rb") as file:
-        SIG = pickle.load(file)
-
-except FileNotFoundError:
-    SIG = {}
-    for index in range(11):
-        n = index + 1
-        SIG[n] = {}
-        gen = multi_q.braiding_generator(n, 3, 3, show=False)
-
-        SIG[n][1] = np.array(gen[0])
-        SIG[n][-1] = np.array(np.linalg.inv(gen[0]))
-
-    basis = gen[1]
-    with open("bin/basis-3q-12a.pickle", "wb") as file:
-        pickle.dump(basis, file)
-    with open("bin/SIG-3q-12a.pickle", "wb") as file:
-        pickle.dump(SIG, file)
+SIG, basis = get_generators("fibonacci", 3, 3)
 
 
 # Pre-Gates for Toffoli
@@ -189,31 +172,12 @@ andd["power"] = (
 result_seq = andd
 
 
-# Calculate matrix representation of the braiding sequance
-w = get_matrix(result_seq, sigma=SIG)
-
-# Extract the matrix in computational space
-result_gate = np.zeros([8, 8]) * (1 + 0j)
-bases = []
-row = 0
-for bb, base in enumerate(basis):
-    if (
-        base["qudits"][0][2] == 0
-        and base["qudits"][1][2] == 0
-        and base["qudits"][2][2] == 0
-    ):
-        column = 0
-        bases.append(base)
-        for cc, case in enumerate(basis):
-
-            if (
-                case["qudits"][0][2] == 0
-                and case["qudits"][1][2] == 0
-                and case["qudits"][2][2] == 0
-            ):
-                result_gate[row, column] = w[bb, cc]
-                column += 1
-        row += 1
+# Computational space
+basis_index = BasisIndex.from_basis(basis)
+rows = basis_index.rows({(0, 2): 0, (1, 2): 0, (2, 2): 0})
+
+# Calculate computational submatrix of the braiding sequance
+result_gate = get_submatrix(result_seq, rows, sigma=SIG)
 
 factor = 1 / np.sqrt(2)
 
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Braid word evaluator
+********************
+
+Evaluates the matrix representation of braid words (same convention as
+braid_matrix_calculator.get_matrix: chronology from left to right) when
+words are edited or share letters:
+
+    + BraidWordEvaluator keeps the partial products of a word in a balanced
+    binary tree: after a single-letter edit, the full unitary is updated
+    with O(log L) matmuls instead of L.
+    + evaluate_words evaluates many words at once, reusing the products of
+    their common prefixes.
+"""
+import numpy as np
+from typing import Dict, List
+from codes.braid_matrix_calculator import EX_SIGMA, generator_power
+
+
+def _compose(earlier, later):
+    """product of two partial products, None standing for identity"""
+    if earlier is None:
+        return later
+    if later is None:
+        return earlier
+    return later @ earlier
+
+
+class BraidWordEvaluator:
+    """
+    Segment tree of the partial products of a braid word.
+
+    Example:
+        evaluator = BraidWordEvaluator(seq, sigma=SIG)
+        evaluator.matrix()                  # == get_matrix(seq, SIG)
+        evaluator.set_letter(10, 3, -1)     # O(log L) matmuls
+        evaluator.product(5, 20)            # letters 5..19 only
+    """
+
+    def __init__(self, seq: Dict, sigma=0):
+        """
+        Inputs:
+            seq: dict:
+                'sigma' and 'power' lists, chronology from left to right.
+            sigma: dict
+                sigma[index][power] generators (default EX_SIGMA), for
+                power = +1/-1; other powers are products of these.
+        """
+        if sigma == 0:
+            sigma = EX_SIGMA
+
+        self.sigma = sigma
+        # sigma_{index}^{power} of the letters, see generator_power
+        self.powers = {}
+        self.seq = {"sigma": list(seq["sigma"]), "power": list(seq["power"])}
+
+        first_index = seq["sigma"][0] if seq["sigma"] else next(iter(sigma))
+        self.dim = sigma[first_index][1].shape[0]
+
+        length = len(self.seq["sigma"])
+        self.size = 1
+        while self.size < max(length, 1):
+            self.size *= 2
+
+        # tree[1] is the root, tree[size + pos] the leaf of letter pos
+        self.tree = [None] * (2 * self.size)
+        for pos, (index, power) in enumerate(zip(self.seq["sigma"],
+                                                 self.seq["power"])):
+            self.tree[self.size + pos] = generator_power(sigma, index, power,
+                                                         self.powers)
+        for node in range(self.size - 1, 0, -1):
+            self.tree[node] = _compose(self.tree[2 * node],
+                                       self.tree[2 * node + 1])
+
+    def __len__(self):
+        return len(self.seq["sigma"])
+
+    def matrix(self) -> "np.ndarray":
+        """
+        matrix representation of the whole word.
+        """
+        if self.tree[1] is None:
+            return np.eye(self.dim)
+        return np.asarray(self.tree[1])
+
+    def set_letter(self, position, index, power):
+        """
+        replaces the letter at position by sigma_{index}^{power} and updates
+        the partial products from its leaf to the root.
+        """
+        if position < 0 or position >= len(self):
+            raise IndexError("position out of the word!")
+
+        self.seq["sigma"][position] = index
+        self.seq["power"][position] = power
+
+        node = self.size + position
+        self.tree[node] = generator_power(self.sigma, index, power,
+                                          self.powers)
+        node //= 2
+        while node >= 1:
+            self.tree[node] = _compose(self.tree[2 * node],
+                                       self.tree[2 * node + 1])
+            node //= 2
+
+    def product(self, start, stop) -> "np.ndarray":
+        """
+        matrix representation of the letters start..stop-1 of the word.
+        """
+        earlier, later = None, None
+        low, high = start + self.size, stop + self.size
+        while low < high:
+            if low % 2:
+                earlier = _compose(earlier, self.tree[low])
+                low += 1
+            if high % 2:
+                high -= 1
+                later = _compose(self.tree[high], later)
+            low //= 2
+            high //= 2
+
+        result = _compose(earlier, later)
+        if result is None:
+            return np.eye(self.dim)
+        return np.asarray(result)
+
+
+def evaluate_words(words: List[Dict], sigma=0) -> List["np.ndarray"]:
+    """
+    matrix representations of many braid words, each prefix product being
+    computed once for all the words that share it.
+
+    Inputs:
+        words: List[dict]:
+            braid words ('sigma' and 'power' lists).
+        sigma: dict
+            sigma[index][power] generators (default EX_SIGMA), for
+            power = +1/-1; other powers are products of these.
+    Returns:
+        List[numpy.array]: in the order of words.
+    """
+    if sigma == 0:
+        sigma = EX_SIGMA
+
+    letters = [list(zip(word["sigma"], word["power"])) for word in words]
+    order = sorted(range(len(words)), key=lambda ii: letters[ii])
+    dim = sigma[next(iter(sigma))][1].shape[0]
+
+    powers = {}
+    results = [None] * len(words)
+    previous = []
+    prefixes = [np.eye(dim)]  # prefixes[k]: product of the k first letters
+    for ii in order:
+        word = letters[ii]
+
+        common = 0
+        while (common < min(len(word), len(previous))
+               and word[common] == previous[common]):
+            common += 1
+
+        del prefixes[common + 1:]
+        for index, power in word[common:]:
+            prefixes.append(generator_power(sigma, index, power, powers)
+                            @ prefixes[-1])
+
+        results[ii] = prefixes[len(word)]
+        previous = word
+
+    return results
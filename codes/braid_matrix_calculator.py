@@ -6,37 +6,129 @@ Created on Thu Sep  3 20:23:40 2020
 @author: abduhu
 """
 import numpy as np
-from copy import deepcopy
-from typing import Dict
+from typing import Dict, List, Tuple
 
 
 def get_global_phase(unitary: "np.ndarray") -> complex:
-    """calculates the global phase of a unitary"""
-    return pow(np.cfloat(np.linalg.det(unitary)), 1 / unitary.shape[0])
+    """
+    calculates the global phase of a unitary, or of each matrix of a
+    (N, n, n) stack: the principal n-th root of its determinant.
+    """
+    unitary = np.asarray(unitary)
+    return np.power(np.linalg.det(unitary).astype(complex),
+                    1 / unitary.shape[-1])
+
+
+def align_phase(unitary_1: "np.ndarray", unitary_2: "np.ndarray") -> complex:
+    """
+    Root of unity c of order n that best aligns two SU(n) matrices,
+    unitary_1 ~ c unitary_2, i.e. minimizes the spectral norm of
+    unitary_1 - c unitary_2, for matrices or (N, n, n) stacks.
+
+    The n-th roots of the determinant of a unitary are defined up to such
+    a root of unity, so aligning with c makes error_distance independent
+    of the branch of get_global_phase. For n = 2 the sign is read from the
+    overlap tr(unitary_2^dagger unitary_1); for n > 2 this overlap only
+    minimizes the Frobenius norm, so the n roots are compared in a single
+    batched spectral_norm.
+    """
+    return _root_distances(unitary_1, unitary_2)[0]
+
+
+def _root_distances(unitary_1, unitary_2):
+    """
+    (c, spectral norm of unitary_1 - c unitary_2) for the root of unity c
+    of align_phase.
+    """
+    unitary_1 = np.asarray(unitary_1)
+    unitary_2 = np.asarray(unitary_2)
+    dim = unitary_1.shape[-1]
+
+    if dim == 2:
+        overlap = np.sum(unitary_2.conjugate() * unitary_1, axis=(-2, -1))
+        root = np.where(overlap.real < 0, -1.0 + 0j, 1.0 + 0j)
+        return root, spectral_norm(unitary_1 - root[..., None, None]
+                                   * unitary_2)
+
+    # (..., n) norms, one per root of unity
+    roots = np.exp(2j * np.pi * np.arange(dim) / dim)
+    norms = spectral_norm(unitary_1[..., None, :, :]
+                          - roots[:, None, None] * unitary_2[..., None, :, :])
+    best = np.argmin(norms, axis=-1)
+
+    return roots[best], np.take_along_axis(
+        norms, np.expand_dims(best, -1), axis=-1)[..., 0]
+
+
+def spectral_norm(matrix: "np.ndarray"):
+    """
+    Largest singular value of a matrix, or of each matrix of a (..., n, n)
+    stack, without eigen-decomposition. For 2x2 matrices [[a, b], [c, d]]
+    it is the closed form
+        s_max^2 = (|D|_F^2 + sqrt((|a|^2 + |c|^2 - |b|^2 - |d|^2)^2
+                                  + 4 |a* b + c* d|^2)) / 2,
+    whose discriminant has no cancellation when the singular values are
+    close (e.g. for differences of SU(2) matrices), otherwise the 2-norm
+    (one SVD per matrix).
+    """
+    matrix = np.asarray(matrix)
+    if matrix.shape[-2:] == (2, 2):
+        a, b = matrix[..., 0, 0], matrix[..., 0, 1]
+        c, d = matrix[..., 1, 0], matrix[..., 1, 1]
+        # D^dagger D = [[p, off], [off*, q]]
+        p = np.abs(a) ** 2 + np.abs(c) ** 2
+        q = np.abs(b) ** 2 + np.abs(d) ** 2
+        off = a.conjugate() * b + c.conjugate() * d
+        return np.sqrt((p + q + np.sqrt((p - q) ** 2
+                                        + 4 * np.abs(off) ** 2)) / 2)
+
+    return np.linalg.norm(matrix, 2, axis=(-2, -1))
 
 
 def error_distance(unitary_1: "np.ndarray", unitary_2: "np.ndarray") -> float:
     """Spectral distance metric between SU(n) matrices"""
 
-    global_phase_1 = get_global_phase(unitary_1)
-    global_phase_2 = get_global_phase(unitary_2)
+    special_1 = unitary_1 / get_global_phase(unitary_1)
+    special_2 = unitary_2 / get_global_phase(unitary_2)
+
+    return min(2.0, float(_root_distances(special_1, special_2)[1]))
+
+
+def error_distance_batch(stack: "np.ndarray",
+                         unitary: "np.ndarray") -> "np.ndarray":
+    """
+    error_distance of each matrix of a (N, n, n) stack of candidates to a
+    unitary, or to the matching matrix of a (N, n, n) stack of unitaries,
+    with batched determinants and spectral norms.
+    Returns:
+        numpy.array of shape (N,)
+    """
+    stack = np.asarray(stack)
+    unitary = np.asarray(unitary)
+
+    candidates = stack / get_global_phase(stack)[..., None, None]
+    targets = unitary / get_global_phase(unitary)[..., None, None]
 
-    error = 2
-    for sign in [-1, 1]:
-        diff = unitary_1 / global_phase_1 + sign * unitary_2 / global_phase_2
-        distance = abs(
-            (max(np.linalg.eig(diff.conjugate().T @ diff)[0])) ** (1 / 2)
-            )
-        if distance < error:
-            error = deepcopy(distance)
-    return error
+    return np.minimum(2, _root_distances(candidates, targets)[1])
 
 
 def leakage_error(unitary: "np.ndarray") -> float:
     """Leakage error using spectral definition"""
 
-    return 1 - abs((
-        min(np.linalg.eig(unitary.conjugate().T @ unitary)[0])) ** (1 / 2))
+    return float(leakage_error_batch(np.asarray(unitary)[None])[0])
+
+
+def leakage_error_batch(stack: "np.ndarray") -> "np.ndarray":
+    """
+    leakage_error of each matrix of a (N, n, n) stack: 1 - its smallest
+    singular value, from the batched eigenvalues of the Hermitian U^dagger U.
+    Returns:
+        numpy.array of shape (N,)
+    """
+    stack = np.asarray(stack)
+    gram = stack.conjugate().transpose(0, 2, 1) @ stack
+
+    return 1 - np.sqrt(np.maximum(np.linalg.eigvalsh(gram)[:, 0], 0))
 
 
 EX_SEQ = {
@@ -60,13 +152,92 @@ SIG_2 = np.array(
     ]
 )
 
+# braiding generators are unitary: sigma^{-1} = sigma^dagger
 EX_SIGMA = {
-    1: {1: SIG_1, -1: np.linalg.inv(SIG_1)},
-    2: {1: SIG_2, -1: np.linalg.inv(SIG_2)},
+    1: {1: SIG_1, -1: SIG_1.conjugate().T},
+    2: {1: SIG_2, -1: SIG_2.conjugate().T},
 }
 
 
-def get_matrix(seq: Dict, sigma=0) -> "np.ndarray":
+def fold_powers(seq: Dict) -> List[Tuple[int, int]]:
+    """
+    Compresses a braid seq into runs of the same generator with their total
+    power. Example:
+        fold_powers({"sigma": [1, 1, 2, 2, 2, 1],
+                     "power": [1, 1, 1, -1, 1, -1]})
+        = [(1, 2), (2, 1), (1, -1)]
+    Runs whose powers cancel are dropped.
+    """
+    runs = []
+    for index, power in zip(seq["sigma"], seq["power"]):
+        if runs and runs[-1][0] == index:
+            runs[-1][1] += power
+            if runs[-1][1] == 0:
+                runs.pop()
+        else:
+            runs.append([index, power])
+
+    return [(index, power) for index, power in runs]
+
+
+def generator_power(sigma, index, power, powers=None):
+    """
+    sigma_{index}^{power} for any nonzero integer power, read from (and
+    stored in) the power table powers[(index, power)]. Each new power costs
+    one product with the previous one.
+    """
+    if powers is None:
+        powers = {}
+
+    sign = 1 if power > 0 else -1
+    for exponent in range(1, abs(power) + 1):
+        key = (index, sign * exponent)
+        if key not in powers:
+            if exponent == 1:
+                powers[key] = sigma[index][sign]
+            else:
+                powers[key] = sigma[index][sign] \
+                    @ powers[(index, sign * (exponent - 1))]
+
+    return powers[(index, power)]
+
+
+def commuting_layers(seq: Dict) -> List[List[Tuple[int, int]]]:
+    """
+    Reorders a braid seq into layers of mutually commuting generators,
+    using only the far commutativity sigma_i sigma_j = sigma_j sigma_i for
+    |i - j| >= 2: each letter is moved to the earliest layer after the
+    last letter it does not commute with (sigma_{i-1} or sigma_{i+1}), and
+    merged with a letter of the same generator if there is one there.
+    Example:
+        commuting_layers({"sigma": [1, 3, 2, 1, 4],
+                          "power": [1, 1, 1, -1, 1]})
+        = [[(1, 1), (3, 1)], [(2, 1), (4, 1)], [(1, -1)]]
+    Returns:
+        List[List[(index, power)]]: chronology from left to right, letters
+        of a layer sorted by index.
+    """
+    layers = []
+    last_layer = {}  # index -> layer of its last letter
+    for index, power in zip(seq["sigma"], seq["power"]):
+        earliest = max(last_layer.get(index - 1, -1),
+                       last_layer.get(index + 1, -1)) + 1
+        same = last_layer.get(index, -1)
+        if same >= earliest:
+            layer = same
+        else:
+            layer = earliest
+            if layer == len(layers):
+                layers.append({})
+        layers[layer][index] = layers[layer].get(index, 0) + power
+        last_layer[index] = layer
+
+    return [sorted((index, power) for index, power in layer.items()
+                   if power != 0)
+            for layer in layers]
+
+
+def get_matrix(seq: Dict, sigma=0, layered=False) -> "np.ndarray":
     """
     Calculates the matrix representation of given braid seq
     Example:
@@ -75,16 +246,157 @@ def get_matrix(seq: Dict, sigma=0) -> "np.ndarray":
         seq: dict:
             chronology from left to right
         sigma: dict
+            sigma[index][power] generators, either numpy arrays or
+            scipy.sparse arrays. Any mapping works, e.g. a lazy
+            generator_cache.GeneratorStore.
+        layered: bool
+            if True, the seq is reordered into layers of commuting
+            generators (see commuting_layers) and each distinct layer is
+            multiplied once into a single operator. With LocalGenerator
+            sigmas, a layer operator keeps the blocks of its generators
+            (see LocalGenerator.compose) and is applied block by block;
+            with dense or sparse sigmas it is a full operator, which only
+            saves products when the same layer repeats.
     Returns:
         numpy.array
     """
     if sigma == 0:
         sigma = EX_SIGMA
 
-    result = np.eye(sigma[1][1].shape[0])
+    # only the generators of the sequence are read from sigma
+    first_index = seq["sigma"][0] if seq["sigma"] else next(iter(sigma))
+    result = np.eye(sigma[first_index][1].shape[0])
+
+    powers = {}
+    if layered:
+        layer_operators = {}
+        for layer in commuting_layers(seq):
+            if not layer:
+                continue
+            key = tuple(layer)
+            if key not in layer_operators:
+                operator = generator_power(sigma, *layer[0], powers)
+                for index, power in layer[1:]:
+                    operator = generator_power(sigma, index, power, powers) \
+                        @ operator
+                layer_operators[key] = operator
+            result = layer_operators[key] @ result
+
+        return result
+
+    # runs of the same generator are applied as one power
+    for index, power in fold_powers(seq):
+        result = generator_power(sigma, index, power, powers) @ result
+
+    return result
+
+
+def get_matrix_batch(words: List[Dict], sigma=0) -> "np.ndarray":
+    """
+    Calculates the matrix representations of many braid words at once.
+    Words are bucketed by length and each bucket is a (batch, dim, dim)
+    stack multiplied by one stacked matmul per letter, so the interpreter
+    cost of a letter is shared by all the words of the bucket.
+    Example:
+        get_matrix_batch(words, sigma)[k] == get_matrix(words[k], sigma)
+    Inputs:
+        words: List[dict]:
+            braid seqs, chronology from left to right
+        sigma: dict
+            sigma[index][power] generators (see get_matrix), converted to
+            dense arrays.
+    Returns:
+        numpy.array of shape (len(words), dim, dim)
+    """
+    if sigma == 0:
+        sigma = EX_SIGMA
+
+    # table of the dense generators the words use, sigma[index][+-1]
+    letters = sorted({(index, 1 if power > 0 else -1)
+                      for word in words
+                      for index, power in zip(word["sigma"], word["power"])})
+    if not letters:
+        letters = [(next(iter(sigma)), 1)]
+    table = np.array([sigma[index][power].toarray()
+                      if hasattr(sigma[index][power], "toarray")
+                      else np.asarray(sigma[index][power])
+                      for index, power in letters], dtype=complex)
+    position = {letter: pos for pos, letter in enumerate(letters)}
+    dim = table.shape[1]
 
-    for _, index in enumerate(seq["sigma"]):
-        power = seq["power"][_]
-        result = sigma[index][power] @ result
+    # letters of a word with power +-k are repeated k times
+    codes = [[position[(index, 1 if power > 0 else -1)]
+              for index, power in zip(word["sigma"], word["power"])
+              for _ in range(abs(power))]
+             for word in words]
+
+    buckets = {}
+    for word_id, word_codes in enumerate(codes):
+        buckets.setdefault(len(word_codes), []).append(word_id)
+
+    result = np.empty((len(words), dim, dim), dtype=complex)
+    for length, word_ids in buckets.items():
+        bucket_codes = np.array([codes[word_id] for word_id in word_ids],
+                                dtype=np.intp).reshape(len(word_ids), length)
+        stack = np.broadcast_to(np.eye(dim, dtype=complex),
+                                (len(word_ids), dim, dim))
+        for step in range(length):
+            stack = np.matmul(table[bucket_codes[:, step]], stack)
+        result[word_ids] = stack
 
     return result
+
+
+def propagate(seq: Dict, states: "np.ndarray", sigma=0) -> "np.ndarray":
+    """
+    Applies a braid seq to a vector (dim,) or to the k columns of a matrix
+    (dim, k) with matrix-vector (matrix-thin-matrix) products, at
+    O(L dim^2 k) cost (O(L dim block k) with local generators) instead of
+    forming the full dim x dim matrix.
+    Inputs:
+        seq: dict:
+            chronology from left to right
+        states: numpy.array
+            input vector or columns.
+        sigma: dict
+            sigma[index][power] generators (see get_matrix).
+    Returns:
+        numpy.array of the shape of states
+    """
+    if sigma == 0:
+        sigma = EX_SIGMA
+
+    result = np.asarray(states)
+    for index, power in fold_powers(seq):
+        sign = 1 if power > 0 else -1
+        for _ in range(abs(power)):
+            result = sigma[index][sign] @ result
+
+    return np.asarray(result)
+
+
+def get_submatrix(seq: Dict, ranks, sigma=0) -> "np.ndarray":
+    """
+    Calculates the k x k submatrix of the matrix representation of a braid
+    seq on the states of indices ranks (e.g. the computational subspace),
+    by propagating only the k columns of these states.
+    Example:
+        get_submatrix(seq, ranks, sigma) == get_matrix(seq, sigma)[
+            np.ix_(ranks, ranks)]
+    Inputs:
+        seq: dict:
+            chronology from left to right
+        ranks: list
+            indices of the states in the basis.
+        sigma: dict
+            sigma[index][power] generators (see get_matrix).
+    Returns:
+        numpy.array
+    """
+    if sigma == 0:
+        sigma = EX_SIGMA
+
+    first_index = seq["sigma"][0] if seq["sigma"] else next(iter(sigma))
+    columns = np.eye(sigma[first_index][1].shape[0])[:, ranks]
+
+    return propagate(seq, columns, sigma)[ranks, :]
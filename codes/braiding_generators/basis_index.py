@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+r"""
+Basis index
+***********
+
+'basis_index' module maps the states of a multi-qudit fusion space to their
+rows in the braiding generators, and answers the usual subspace queries
+from precomputed label masks:
+    + row of a state,
+    + rows whose qudit k has the label x at a given position (e.g. the
+    computational states, whose qudits end in 0),
+    + rows with total charge t,
+    + groups of rows that a braiding generator sigma_n can couple.
+
+An index is built once per (model, n_qudits, qudit_len) by get_basis_index.
+"""
+import numpy as np
+from functools import lru_cache
+from codes.braiding_generators.compact_basis import (
+    CompactBasis,
+    BITS_PER_LABEL,
+)
+
+LABELS = [0, 1, 2]
+
+
+class BasisIndex(CompactBasis):
+    """
+    Compact basis of a multi-qudit fusion space with boolean masks of the
+    rows holding each label in each label column.
+
+    Example:
+        basis_index = get_basis_index("fibonacci", 3, 3)
+        rows = basis_index.rows({(0, -1): 0, (1, -1): 0, (2, -1): 0})
+        submatrix = w[np.ix_(rows, rows)]
+    """
+
+    def __init__(self, labels, n_qudits, qudit_len):
+        super().__init__(labels, n_qudits, qudit_len)
+        # masks[column][label]: rows whose label in column equals label
+        self.masks = [[self.labels[:, column] == label for label in LABELS]
+                      for column in range(self.n_labels)]
+
+    def column(self, qudit, position):
+        """
+        column of the label i_{qudit, position} in the label array.
+        """
+        return qudit * self.qudit_len + position % self.qudit_len
+
+    def charge_column(self):
+        """
+        column of the total charge: the last root, or the last label of the
+        qudit if there is only one.
+        """
+        return self.n_labels - 1
+
+    def mask(self, qudit_labels=None, charge=None):
+        """
+        boolean mask of the rows verifying all the conditions.
+
+        Inputs:
+            qudit_labels: dict:
+                {(qudit, position): label}, e.g. {(0, -1): 0} selects the
+                states whose first qudit ends in 0.
+            charge: int:
+                total charge of the states.
+        Returns:
+            numpy.array of bool.
+        """
+        mask = np.ones(len(self), dtype=bool)
+        for (qudit, position), label in (qudit_labels or {}).items():
+            mask &= self.masks[self.column(qudit, position)][label]
+        if charge is not None:
+            mask &= self.masks[self.charge_column()][charge]
+
+        return mask
+
+    def rows(self, qudit_labels=None, charge=None):
+        """
+        rows of the states verifying all the conditions (see mask), in the
+        order of the basis.
+        """
+        return np.flatnonzero(self.mask(qudit_labels, charge))
+
+    def generator_columns(self, index):
+        """
+        label columns that the braiding generator sigma_{index} can change:
+        one label of a qudit for a local generator; the last label of qudit
+        m, the labels of qudit m + 1 and the root j_{m-1} for a generator
+        between the qudits m and m + 1.
+        """
+        qudit_len = self.qudit_len
+        if index <= 0 or index >= self.n_qudits * (qudit_len + 1):
+            raise ValueError("index value is not valid!")
+
+        if index % (qudit_len + 1) > 0:
+            m = index // (qudit_len + 1)
+            position = index % (qudit_len + 1) - 2
+            if position < 0:
+                return []
+            return [self.column(m, position)]
+
+        m = (index // (qudit_len + 1)) - 1
+        columns = [self.column(m, qudit_len - 1)]
+        columns += [self.column(m + 1, position)
+                    for position in range(qudit_len)]
+        if m > 0:
+            columns.append(self.n_qudits * qudit_len + m - 1)
+
+        return columns
+
+    def coupled_rows(self, index):
+        """
+        groups of rows that the braiding generator sigma_{index} can couple:
+        states that agree on every label sigma_{index} leaves unchanged.
+
+        Returns:
+            List[List[int]]: rows of each group, in the order of the basis.
+        """
+        changed = 0
+        for column in self.generator_columns(index):
+            changed |= ((1 << BITS_PER_LABEL) - 1) << (BITS_PER_LABEL * column)
+        keys = self.codes & ~np.int64(changed)
+
+        order = np.argsort(keys, kind="stable")
+        boundaries = np.flatnonzero(np.diff(keys[order])) + 1
+
+        return [group.tolist() for group in np.split(order, boundaries)]
+
+
+@lru_cache(maxsize=None)
+def get_basis_index(model, n_qudits, qudit_len):
+    """
+    index of the basis of a multi-qudit register, built once per
+    (model, n_qudits, qudit_len).
+
+    Inputs:
+        model: str:
+            "fibonacci" or "ising".
+        n_qudits: int:
+            number of qudits.
+        qudit_len: int:
+            number of outcomes representing one qudit.
+    Returns:
+        BasisIndex
+    """
+    from codes.braiding_generators.models import get_model
+
+    basis = get_model(model).find_basis(n_qudits, qudit_len)
+    return BasisIndex.from_basis(basis)
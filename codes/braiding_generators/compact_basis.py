@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+r"""
+Compact basis
+*************
+
+'compact_basis' module stores the basis of a multi-qudit fusion space
+(Fibonacci or Ising) as integers instead of Python dicts of lists.
+
+The labels of a state are flattened qudit by qudit, then roots:
+    Example:
+        {'qudits': [[i, j], [k, l], [e, f]], 'roots': [m, t]}
+        -> [i, j, k, l, e, f, m, t]
+
+and every label (0, 1 or 2) is packed on 2 bits of an int64 code, the first
+label in the lowest bits. A basis is then a (dim, n_labels) uint8 array of
+labels, an array of codes and a hash index from code to basis position.
+"""
+import numpy as np
+
+BITS_PER_LABEL = 2
+MAX_LABELS = 63 // BITS_PER_LABEL
+
+
+def state_to_labels(state):
+    """
+    flattens the labels of a state, qudit by qudit then roots.
+
+    Inputs:
+        state: dict:
+            {'qudits': [[...], ...], 'roots': [...]}
+    Returns:
+        List: labels.
+    """
+    return [label for qudit in state["qudits"] for label in qudit] \
+        + list(state["roots"])
+
+
+def labels_to_state(labels, n_qudits, qudit_len):
+    """
+    rebuilds the dict of a state from its flattened labels.
+
+    Inputs:
+        labels: sequence of int.
+        n_qudits: int:
+            number of qudits.
+        qudit_len: int:
+            number of outcomes representing one qudit.
+    Returns:
+        dict: {'qudits': [[...], ...], 'roots': [...]}
+    """
+    labels = [int(label) for label in labels]
+    return {
+        "qudits": [labels[ii * qudit_len:(ii + 1) * qudit_len]
+                   for ii in range(n_qudits)],
+        "roots": labels[n_qudits * qudit_len:],
+    }
+
+
+def encode(labels):
+    """
+    packs flattened labels into one integer code.
+    """
+    if len(labels) > MAX_LABELS:
+        raise ValueError(f"At most {MAX_LABELS} labels can be encoded!")
+
+    code = 0
+    for ii, label in enumerate(labels):
+        code |= int(label) << (BITS_PER_LABEL * ii)
+    return code
+
+
+def decode(code, n_labels):
+    """
+    unpacks an integer code into its n_labels flattened labels.
+    """
+    mask = (1 << BITS_PER_LABEL) - 1
+    return [(code >> (BITS_PER_LABEL * ii)) & mask for ii in range(n_labels)]
+
+
+class CompactBasis:
+    """
+    Basis of a multi-qudit fusion space stored as a (dim, n_labels) uint8
+    array of labels, with packed int64 codes and a hash index from code to
+    basis position.
+
+    Example:
+        compact = CompactBasis.from_basis(find_basis(3, 3))
+        compact.position(state)  # row of state in the basis
+        compact[row]             # state in the dict format
+    """
+
+    def __init__(self, labels, n_qudits, qudit_len):
+        """
+        Inputs:
+            labels: array-like of shape (dim, n_labels):
+                flattened labels of the states, in the order of the basis.
+            n_qudits: int:
+                number of qudits.
+            qudit_len: int:
+                number of outcomes representing one qudit.
+        """
+        n_labels = n_qudits * qudit_len + n_qudits - 1
+        if n_labels > MAX_LABELS:
+            raise ValueError(f"At most {MAX_LABELS} labels can be encoded!")
+
+        self.n_qudits = n_qudits
+        self.qudit_len = qudit_len
+        self.labels = np.asarray(labels, dtype=np.uint8)\
+            .reshape(-1, n_labels)
+        self.codes = self._encode_rows(self.labels)
+        self.index = dict(zip(self.codes.tolist(), range(len(self.codes))))
+
+    @staticmethod
+    def _encode_rows(labels):
+        shifts = BITS_PER_LABEL * np.arange(labels.shape[1], dtype=np.int64)
+        return (labels.astype(np.int64) << shifts).sum(axis=1)
+
+    @classmethod
+    def from_basis(cls, basis):
+        """
+        converts a basis in the dict format (as returned by find_basis).
+        """
+        n_qudits = len(basis[0]["qudits"])
+        qudit_len = len(basis[0]["qudits"][0])
+        return cls([state_to_labels(state) for state in basis],
+                   n_qudits, qudit_len)
+
+    def to_basis(self):
+        """
+        converts back to the dict format (as returned by find_basis).
+        """
+        return [self[row] for row in range(len(self))]
+
+    @property
+    def n_labels(self):
+        return self.labels.shape[1]
+
+    def __len__(self):
+        return self.labels.shape[0]
+
+    def __getitem__(self, row):
+        return labels_to_state(self.labels[row], self.n_qudits,
+                               self.qudit_len)
+
+    def __contains__(self, state):
+        return encode(state_to_labels(state)) in self.index
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, CompactBasis)
+            and self.n_qudits == other.n_qudits
+            and self.qudit_len == other.qudit_len
+            and np.array_equal(self.codes, other.codes)
+        )
+
+    def code(self, state):
+        """
+        integer code of a state given in the dict format.
+        """
+        return encode(state_to_labels(state))
+
+    def position(self, state):
+        """
+        position of a state (dict format) in the basis.
+        """
+        return self.index[self.code(state)]
+
+    def __getstate__(self):
+        # only the labels are pickled, codes and index are rebuilt
+        return {"labels": self.labels, "n_qudits": self.n_qudits,
+                "qudit_len": self.qudit_len}
+
+    def __setstate__(self, state):
+        self.__init__(state["labels"], state["n_qudits"], state["qudit_len"])
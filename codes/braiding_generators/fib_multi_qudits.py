@@ -32,10 +32,15 @@ TODO:
     - Translate to Cpp
 """
 
+import numpy as np
 import codes.braiding_generators.fib_qudit as fibo
-from codes.braiding_generators.fib_qudit import F, B
+from codes.braiding_generators.fib_qudit import F_elem, B_elem
 from copy import deepcopy
+from functools import lru_cache
+from itertools import product
 from codes.cplot import cplot
+from codes.braiding_generators.local_generator import LocalGenerator
+from codes.braiding_generators.basis_index import BasisIndex
 
 
 def check_state(state):
@@ -89,63 +94,59 @@ def check_state(state):
     return check
 
 
+def iter_roots(qudits):
+    """
+    generates all root outcomes that fuse the given qudits one by one.
+
+    Inputs:
+        qudits: List[List]:
+            states of the qudits.
+    Yields:
+        List: roots outcomes [j_1, j_2, ...].
+    """
+    def walk(previous_outcome, ii, roots):
+        if ii == len(qudits):
+            yield list(roots)
+            return
+        for outcome in [0, 1]:
+            if fibo.check_rule(previous_outcome, qudits[ii][-1], outcome):
+                roots.append(outcome)
+                yield from walk(outcome, ii + 1, roots)
+                roots.pop()
+
+    yield from walk(qudits[0][-1], 1, [])
+
+
 def find_basis(n_qudits, qudit_len):
     """
     generates all states that form the basis of Hilbert space
     of anyons grouped by qudits and fused qudit by qudit.
 
+    Valid states are built from the basis of one qudit and the fusion rules
+    of the roots, then sorted in the order of the binary enumeration of the
+    labels (i_{11}, i_{21}, ..., i_{12}, i_{22}, ..., j_1, j_2, ...), the first
+    label varying fastest.
+
     Inputs:
         n_qudits: int:
             number of qudits.
         qudit_len: int:
             number of outcomes representing one qudit.
     """
+    one_qudit_basis = fibo.find_basis(qudit_len + 1)
 
-    n_roots = n_qudits - 1
-    n_labels = n_qudits * qudit_len + n_roots
-    
-    def fill_state(labels):
-        state = {"qudits": [], "roots": []}
-        for ii in range(n_qudits):
-            state["qudits"].append([])
-            for jj in range(qudit_len):
-                state["qudits"][-1].append(0)
-        
-        ll = 0
-        for ii in range(qudit_len):
-            for jj in range(n_qudits):
-                state["qudits"][jj][ii] = labels[ll]
-                ll += 1
-        
-        for ii in range(n_roots):
-            state["roots"].append(labels[ll])
-            ll += 1
-
-        return state
-
-    # generate all combinations and verify if it is valid state
-    new_comb = []
-    final_comb = []
-    for _ in range(n_labels):
-        new_comb.append(0)
-        final_comb.append(1)
-        
-    new_state = fill_state(new_comb)
     states = []
-    if check_state(new_state):
-        states.append(new_state)
+    for qudits in product(one_qudit_basis, repeat=n_qudits):
+        for roots in iter_roots(qudits):
+            states.append({"qudits": [list(qudit) for qudit in qudits],
+                           "roots": roots})
 
-    while not new_comb == final_comb:
-        for ii, label in enumerate(new_comb):
-            if label == 0:
-                new_comb[ii] = 1
-                break
-            else:
-                new_comb[ii] = 0
+    def order(state):
+        labels = [qudit[ii] for ii in range(qudit_len)
+                  for qudit in state["qudits"]] + state["roots"]
+        return labels[::-1]
 
-        new_state = fill_state(new_comb)
-        if check_state(new_state):
-            states.append(new_state)
+    states.sort(key=order)
 
     return states
 
@@ -280,6 +281,11 @@ def L(k, h, i_, i, jj_, jj):
     two anyons separated in two qudits.
     (see report)
 
+    The sum over the intermediate labels [p_1, ..., p_q] is contracted site
+    by site as a chain product of F-move transfer matrices, so the cost is
+    linear in the qudit length. Components are cached for the whole
+    generator build.
+
     Inputs:
         k: int: k
         h: int: i_{m(q-1)}
@@ -288,52 +294,38 @@ def L(k, h, i_, i, jj_, jj):
         jj_: list: [i'_{(m+1)1},....i'_{(m+1)q}]
         jj: list: [i_{(m+1)1},....i_{(m+1)q}]
     """
-    component = 0 + 0j
+    return _L(k, h, i_, i, tuple(jj_), tuple(jj))
 
-    qudit_len = len(jj)
-    jjj_ = deepcopy(jj_)
-    jjj = deepcopy(jj)
-    jjj_ = [1] + jjj_
-    jjj = [1] + jjj
-
-    init_p = [0] * qudit_len
-    final_p = [1] * qudit_len
-    new_p = init_p
-    while new_p != final_p:
-        pp = deepcopy(new_p)
-        pp.append(k)
-        product = 1 + 0j
-        for ii in range(qudit_len):
-            product = (
-                product
-                * F(i, jjj[ii], 1, pp[ii + 1]).T.conjugate()[jjj[ii + 1],
-                                                             pp[ii]]
-                * F(i_, jjj_[ii], 1, pp[ii + 1])[pp[ii], jjj_[ii + 1]]
-            )
-
-        product = product * B(h, 1, 1, pp[0])[i, i_]
-        component += product
-        # iterate
-        for ii, label in enumerate(new_p):
-            if label == 0:
-                new_p[ii] = 1
-                break
-            else:
-                new_p[ii] = 0
-
-    # final iteration
-    pp = deepcopy(new_p)
-    pp.append(k)
-    product = 1 + 0j
-    for ii in range(qudit_len):
-        product = (
-            product
-            * F(i, jjj[ii], 1, pp[ii + 1]).T.conjugate()[jjj[ii + 1], pp[ii]]
-            * F(i_, jjj_[ii], 1, pp[ii + 1])[pp[ii], jjj_[ii + 1]]
-        )
 
-    product = product * B(h, 1, 1, pp[0])[i, i_]
-    component += product
+@lru_cache(maxsize=None)
+def _L(k, h, i_, i, jj_, jj):
+    """
+    L component for hashable (tuple) labels.
+    """
+    jjj_ = (1,) + jj_
+    jjj = (1,) + jj
+
+    # amplitudes of the intermediate label p_{ii}, starting from p_q = k
+    amplitudes = [0j] * len(fibo.LABELS)
+    amplitudes[k] = 1 + 0j
+    for ii in reversed(range(len(jj))):
+        new_amplitudes = [0j] * len(fibo.LABELS)
+        for pp in fibo.LABELS:
+            for pp_next, amplitude in enumerate(amplitudes):
+                if amplitude == 0:
+                    continue
+                new_amplitudes[pp] += (
+                    amplitude
+                    * F_elem(i, jjj[ii], 1, pp_next,
+                             pp, jjj[ii + 1]).conjugate()
+                    * F_elem(i_, jjj_[ii], 1, pp_next, pp, jjj_[ii + 1])
+                )
+        amplitudes = new_amplitudes
+
+    component = 0 + 0j
+    for pp, amplitude in enumerate(amplitudes):
+        if amplitude != 0:
+            component += amplitude * B_elem(h, 1, 1, pp, i, i_)
 
     return component
 
@@ -358,9 +350,9 @@ def S(jm, jmo, jmoo, jmo_, h, i_, i, jj_, jj):
 
     for kk in [0, 1]:
         component += (
-            F(jmoo, i, jj[-1], jm)[jmo, kk]
+            F_elem(jmoo, i, jj[-1], jm, jmo, kk)
             * L(kk, h, i_, i, jj_, jj)
-            * F(jmoo, i_, jj_[-1], jm).T.conjugate()[kk, jmo_]
+            * F_elem(jmoo, i_, jj_[-1], jm, jmo_, kk).conjugate()
         )
 
     return component
@@ -474,7 +466,62 @@ def sigma(index_, state_f_, state_i_):
     return amplitude
 
 
-def braiding_generator(index, n_qudits, qudit_len, show=True):
+def coupled_states(index, basis):
+    """
+    groups the states of basis that the braiding generator sigma_{index}
+    can couple: a local generator only changes one label of one qudit,
+    a generator between the qudits m and m + 1 only changes the last label
+    of qudit m, the labels of qudit m + 1 and the root j_{m-1}.
+
+    Inputs:
+        index: int:
+            index of braiding operator.
+        basis: List[dict] or BasisIndex:
+            basis of the multi-qudit fusion space.
+    Returns:
+        List[List[int]]: positions in basis of the states of each group.
+    """
+    if not isinstance(basis, BasisIndex):
+        basis = BasisIndex.from_basis(basis)
+
+    return basis.coupled_rows(index)
+
+
+def generator_elements(index, groups, basis):
+    """
+    components of the braiding generator sigma_{index} that can be nonzero:
+    the blocks of the groups of states it couples.
+
+    Inputs:
+        index: int:
+            index of braiding operator.
+        groups: List[List[int]]:
+            groups of coupled states (see coupled_states), or a part of
+            them.
+        basis: List[dict]:
+            basis of the fusion space.
+    Returns:
+        (List[numpy.array]: block of each group, List[int]: rows,
+        List[int]: columns, List[complex]: nonzero components)
+    """
+    blocks = []
+    rows, columns, data = [], [], []
+    for group in groups:
+        blocks.append(np.zeros([len(group), len(group)], dtype=complex))
+        for ff, f in enumerate(group):
+            for ii, i in enumerate(group):
+                amplitude = sigma(index, basis[f], basis[i])
+                if amplitude != 0:
+                    blocks[-1][ff, ii] = amplitude
+                    rows.append(f)
+                    columns.append(i)
+                    data.append(amplitude)
+
+    return blocks, rows, columns, data
+
+
+def braiding_generator(index, n_qudits, qudit_len, show=True, sparse=False,
+                       inverse=False, local=False, register=None):
     """
     calculates matrix representation of the braiding generator -in the basis
     of multi-qudit fusion space- which exchanges
@@ -487,21 +534,60 @@ def braiding_generator(index, n_qudits, qudit_len, show=True):
             number of qudits.
         qudit_len: int:
             number of outcomes representing one qudit.
+        sparse: bool:
+            if True, the matrix is returned as a scipy.sparse CSR array.
+        inverse: bool:
+            if True, returns the inverse generator sigma_{index}^{-1},
+            the conjugate transpose of the unitary sigma_{index}.
+        local: bool:
+            if True, the generator is returned as a LocalGenerator storing
+            only its blocks on the coupled states.
+        register: Register:
+            basis and groups of coupled states shared by the generators of
+            the register (default get_register("fibonacci", n_qudits,
+            qudit_len)).
     Returns:
-        (numpy.array whose dimension equals to the dimension of
-        anyons' Hilbert space, basis)
+        (numpy.array (or scipy.sparse.csr_array, or LocalGenerator) whose
+        dimension equals to the dimension of anyons' Hilbert space, basis)
+        The basis is a copy: the register keeps its own.
     """
 
-    # basis of Hilbert space
-    basis = find_basis(n_qudits, qudit_len)
+    # basis of Hilbert space, shared by the generators of the register
+    if register is None:
+        from codes.braiding_generators.register import get_register
+
+        register = get_register("fibonacci", n_qudits, qudit_len)
+    basis = register.basis
+
+    # compute the components of the braiding matrix that can be nonzero
+    groups = register.coupled_states(index)
+    blocks, rows, columns, data = generator_elements(index, groups, basis)
+
+    if local:
+        sig = LocalGenerator(len(basis), groups, blocks)
+        if inverse:
+            sig = sig.inverse()
+        if show:
+            cplot(sig.toarray())
+
+        return sig, deepcopy(basis)
+
+    if sparse:
+        from scipy.sparse import csr_array
+
+        sig = csr_array((np.array(data, dtype=complex), (rows, columns)),
+                        shape=(len(basis), len(basis)))
+    else:
+        sig = np.zeros([len(basis), len(basis)], dtype=complex)
+        sig[rows, columns] = data
+
+    if inverse:
+        # braiding generators are unitary
+        sig = sig.conjugate().T
+        if sparse:
+            sig = sig.tocsr()
 
-    # compute components of the braiding matrix
-    sig = []
-    for f, state_f in enumerate(basis):
-        sig.append([])
-        for i, state_i in enumerate(basis):
-            sig[f].append(sigma(index, state_f, state_i))
     if show:
-        cplot(sig)
+        cplot(sig.toarray() if sparse else sig)
 
-    return sig, basis
+    return sig, deepcopy(basis)
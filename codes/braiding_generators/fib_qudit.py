@@ -31,7 +31,6 @@ This model is designed to:
 """
 import numpy as np
 from typing import List
-from copy import deepcopy
 from codes.cplot import cplot
 
 
@@ -77,6 +76,49 @@ def check_state(outcomes: List):
     return check
 
 
+def iter_basis(n_anyons):
+    """
+    lazily generates the states that form the basis of Hilbert space of
+    n_anyons, in the same order as find_basis.
+
+    Only valid label sequences are visited: the labels reachable from the
+    left by the fusion rules are computed first, then the fusion tree is
+    walked from its last outcome back to its first one, so the cost scales
+    with the dimension of the space rather than with 2^(n_anyons - 1).
+
+    Inputs:
+        n_anyons: int:
+            number of anyons.
+    Yields:
+        List: state with its labeling outcomes.
+    """
+    n_labels = max(n_anyons - 1, 0)
+
+    # outcomes reachable at each position of the fusion tree
+    reachable = []
+    previous_outcomes = [1]
+    for _ in range(n_labels):
+        outcomes = [outcome for outcome in [0, 1]
+                    if any(check_rule(previous, 1, outcome)
+                           for previous in previous_outcomes)]
+        reachable.append(outcomes)
+        previous_outcomes = outcomes
+
+    state = [0] * n_labels
+
+    def walk(position, next_outcome):
+        # the first label varies fastest, as in the binary enumeration
+        if position < 0:
+            yield list(state)
+            return
+        for outcome in reachable[position]:
+            if next_outcome is None or check_rule(outcome, 1, next_outcome):
+                state[position] = outcome
+                yield from walk(position - 1, outcome)
+
+    yield from walk(n_labels - 1, None)
+
+
 def find_basis(n_anyons):
     """
     generates all states that form the basis of Hilbert space of n_anyons.
@@ -86,35 +128,7 @@ def find_basis(n_anyons):
     Returns:
         List[List]: list of states with their labeling outcomes.
     """
-    n_labels = n_anyons - 1
-
-    # Generate all combinations and check if
-    # they verify Fibonacci rules
-    # (To do) combinations can be generated with binary methods.
-
-    new_comb = []
-    final_comb = []
-    for _ in range(n_labels):
-        new_comb.append(0)
-        final_comb.append(1)
-    
-    states = []
-    if check_state(new_comb):
-        new_state = deepcopy(new_comb)
-        states.append(new_state)
-
-    while not new_comb == final_comb:
-        for i, label in enumerate(new_comb):
-            if label == 0:
-                new_comb[i] = 1
-                break
-            else:
-                new_comb[i] = 0
-        if check_state(new_comb):
-            new_state = deepcopy(new_comb)
-            states.append(new_state)
-
-    return states
+    return list(iter_basis(n_anyons))
 
 
 def F(a1, a2, a3, outcome):
@@ -179,6 +193,45 @@ def B(a0, a1, a2, outcome):
     return b_matrix
 
 
+# Lookup tables of F, R and B components indexed by integer labels:
+# F_TABLE[a1, a2, a3, outcome, i, j] = F(a1, a2, a3, outcome)[i, j]
+LABELS = [0, 1]
+F_TABLE = np.array([[[[F(a1, a2, a3, outcome) for outcome in LABELS]
+                      for a3 in LABELS] for a2 in LABELS] for a1 in LABELS],
+                   dtype=float)
+R_TABLE = np.array([[R(a1, a2) for a2 in LABELS] for a1 in LABELS],
+                   dtype=complex)
+B_TABLE = np.array([[[[B(a0, a1, a2, outcome) for outcome in LABELS]
+                      for a2 in LABELS] for a1 in LABELS] for a0 in LABELS],
+                   dtype=complex)
+
+# nested lists give allocation-free scalar access
+_F_ELEMS = F_TABLE.tolist()
+_R_ELEMS = R_TABLE.tolist()
+_B_ELEMS = B_TABLE.tolist()
+
+
+def F_elem(a1, a2, a3, outcome, i, j):
+    """
+    component [i, j] of the F matrix F(a1, a2, a3, outcome)
+    """
+    return _F_ELEMS[a1][a2][a3][outcome][i][j]
+
+
+def R_elem(a1, a2, i, j):
+    """
+    component [i, j] of the R matrix R(a1, a2)
+    """
+    return _R_ELEMS[a1][a2][i][j]
+
+
+def B_elem(a0, a1, a2, outcome, i, j):
+    """
+    component [i, j] of the braiding matrix B(a0, a1, a2, outcome)
+    """
+    return _B_ELEMS[a0][a1][a2][outcome][i][j]
+
+
 def sigma(index, state_f, state_i):
     """
     Amplitude of getting state_f by applying the braiding operator
@@ -210,10 +263,10 @@ def sigma(index, state_f, state_i):
     if ket != bra:
         return 0
 
-    return B(a0, 1, 1, outcome)[a, b]
+    return B_elem(a0, 1, 1, outcome, a, b)
 
 
-def braiding_generator(index, n_anyons, show=True):
+def braiding_generator(index, n_anyons, show=True, inverse=False):
     """
     calculates the matrix of the braiding generator that exchange
     index'th anyon with the (index + 1)'th anyon.
@@ -221,6 +274,9 @@ def braiding_generator(index, n_anyons, show=True):
         index: int:
         n_anyons: int:
             number of anyons.
+        inverse: bool:
+            if True, returns the inverse generator sigma_{index}^{-1},
+            the conjugate transpose of the unitary sigma_{index}.
     Returns:
         (numpy.array whose dimension equals to the dimension of
         anyons' Hilbert space, basis)
@@ -228,13 +284,36 @@ def braiding_generator(index, n_anyons, show=True):
 
     # basis of Hilbert space
     basis = find_basis(n_anyons)
+    if index <= 0 or index > n_anyons - 1:
+        raise ValueError("index value is not valid!")
+
+    # sigma_{index} only couples states that differ in the label between
+    # the two exchanged anyons: group states by their other labels
+    blocks = {}
+    for row, state in enumerate(basis):
+        stt = [1] + state
+        key = tuple(stt[:index - 1] + stt[index:])
+        blocks.setdefault(key, []).append(row)
+
+    # fill each block from the table of braiding matrices
+    sig = np.zeros([len(basis), len(basis)], dtype=complex)
+    for rows in blocks.values():
+        state = basis[rows[0]]
+        if index - 2 < 0:
+            a0 = 0
+        elif index - 2 == 0:
+            a0 = 1
+        else:
+            a0 = state[index - 3]
+        outcome = state[index - 1]
+
+        labels = [([1] + basis[row])[index - 1] for row in rows]
+        sig[np.ix_(rows, rows)] = \
+            B_TABLE[a0, 1, 1, outcome][np.ix_(labels, labels)].T
+
+    if inverse:
+        sig = sig.conjugate().T
 
-    # compute components of the braiding matrix
-    sig = []
-    for f, state_f in enumerate(basis):
-        sig.append([])
-        for i, state_i in enumerate(basis):
-            sig[f].append(sigma(index, state_f, state_i))
     if show:
         cplot(sig)
 
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+r"""
+Generator cache
+***************
+
+'generator_cache' module stores the basis and the braiding generators
+sigma_n^{+1} and sigma_n^{-1} of a multi-qudit register on disk, so scripts
+compute them once:
+
+    SIG, basis = get_generators("fibonacci", 3, 3)
+    w = get_matrix(seq, sigma=SIG)
+
+Each register is stored in its own directory, named after its shape and the
+hash of its key (model, n_qudits, qudit_len, sparse, CACHE_VERSION):
+
+    bin/fibonacci-3q-3l-<hash>/
+        manifest.json       key of the register, written last
+        basis.npy           (dim, n_labels) uint8 labels (see compact_basis)
+        sigma_1.npy         sigma_1
+        sigma_2.npy         sigma_2
+        ...
+
+or, for sparse registers, sigma_n.npz scipy.sparse CSR files. Only sigma_n
+is stored: braiding generators are unitary, so sigma_n^{-1} is derived as
+the conjugate transpose on load.
+
+A directory is built in a temporary directory and renamed at once, so
+concurrent builds never expose partial files: the first rename wins and the
+others are discarded.
+
+Generators are read lazily by a GeneratorStore: get_matrix only pages in
+the generators a sequence touches, and dense generators are memory-mapped,
+so processes evaluating sequences share the page cache.
+"""
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+import numpy as np
+from collections.abc import Mapping
+from codes.braiding_generators.compact_basis import CompactBasis
+from codes.braiding_generators.register import get_register
+
+# Bump when the stored format or the computed generators change
+CACHE_VERSION = 2
+
+CACHE_DIR = os.environ.get("TQC_CACHE_DIR", "bin")
+
+
+def register_key(model, n_qudits, qudit_len, sparse=False):
+    """
+    key identifying the stored generators of a register.
+    """
+    return {"model": model, "n_qudits": n_qudits, "qudit_len": qudit_len,
+            "sparse": sparse, "version": CACHE_VERSION}
+
+
+def register_dir(model, n_qudits, qudit_len, cache_dir=None, sparse=False):
+    """
+    content-addressed directory of the generators of a register.
+    """
+    key = register_key(model, n_qudits, qudit_len, sparse)
+    digest = hashlib.sha256(
+        json.dumps(key, sort_keys=True).encode()).hexdigest()[:16]
+    return os.path.join(cache_dir or CACHE_DIR,
+                        f"{model}-{n_qudits}q-{qudit_len}l-{digest}")
+
+
+def _is_valid(path, key):
+    try:
+        with open(os.path.join(path, "manifest.json")) as file:
+            return json.load(file)["key"] == key
+    except (OSError, ValueError, KeyError):
+        return False
+
+
+def inverse(gen):
+    """
+    inverse of a braiding generator: generators are unitary, so it is the
+    conjugate transpose, without the cost and rounding of a general
+    inverse. The transpose is a view; NumPy has no conjugating view, so
+    the conjugate of a dense generator is one elementwise pass.
+    """
+    if hasattr(gen, "tocsr"):
+        return gen.conjugate().T.tocsr()
+    return gen.conjugate().T
+
+
+def build_generators(model, n_qudits, qudit_len, sparse=False, workers=None):
+    """
+    computes the basis and the braiding generators of a register.
+
+    Inputs:
+        workers: int:
+            number of worker processes (see parallel_build); None
+            (default) or 1 builds the generators in the calling process.
+    Returns:
+        (dict: SIG[n][power] for n = 1..n_anyons-1 and power = +1/-1,
+        CompactBasis)
+    """
+    register = get_register(model, n_qudits, qudit_len)
+    sigma = register.generators(sparse=sparse, workers=workers)
+
+    return sigma, CompactBasis(register.basis_index.labels, n_qudits,
+                               qudit_len)
+
+
+def save_generators(path, key, sigma, compact_basis):
+    """
+    writes generators and basis atomically to the directory path.
+    Returns False if another process stored them first.
+    """
+    parent = os.path.dirname(os.path.abspath(path))
+    os.makedirs(parent, exist_ok=True)
+
+    tmp_path = tempfile.mkdtemp(dir=parent, prefix=".tmp-")
+    try:
+        np.save(os.path.join(tmp_path, "basis.npy"), compact_basis.labels)
+        for n, gens in sigma.items():
+            file_name = os.path.join(tmp_path, f"sigma_{n}")
+            if key.get("sparse"):
+                from scipy.sparse import save_npz
+
+                save_npz(file_name + ".npz", gens[1])
+            else:
+                np.save(file_name + ".npy", gens[1])
+
+        manifest = {"key": key, "dim": len(compact_basis),
+                    "indices": sorted(sigma)}
+        with open(os.path.join(tmp_path, "manifest.json"), "w") as file:
+            json.dump(manifest, file)
+
+        if os.path.exists(path):
+            # stale or incomplete directory of a previous version
+            if _is_valid(path, key):
+                return False
+            shutil.rmtree(path, ignore_errors=True)
+        try:
+            os.rename(tmp_path, path)
+        except OSError:
+            # another process stored the same generators meanwhile
+            return False
+        return True
+    finally:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+
+
+class GeneratorPowers(Mapping):
+    """
+    Powers {1: sigma_n, -1: sigma_n^{-1}} of a stored generator. The
+    inverse is computed on its first access only, so a sequence that only
+    uses sigma_n keeps reading the memory-mapped file without a private
+    copy.
+    """
+
+    def __init__(self, gen):
+        self._powers = {1: gen}
+
+    def __getitem__(self, power):
+        if power == -1 and -1 not in self._powers:
+            self._powers[-1] = inverse(self._powers[1])
+        return self._powers[power]
+
+    def __iter__(self):
+        return iter((1, -1))
+
+    def __len__(self):
+        return 2
+
+
+class GeneratorStore(Mapping):
+    """
+    Braiding generators of a register directory, SIG[n][power], read from
+    disk on first access. Dense generators are memory-mapped, sparse ones
+    are loaded as scipy.sparse CSR arrays. SIG[n][-1] is the conjugate
+    transpose of SIG[n][1], computed when it is first used.
+
+    A store pickles as its path, so worker processes reopen the same
+    memory-mapped files instead of receiving copies.
+    """
+
+    def __init__(self, path, indices, sparse=False, mmap=True):
+        self.path = path
+        self.indices = list(indices)
+        self.sparse = sparse
+        self.mmap = mmap
+        self._generators = {}
+
+    def _load(self, file_name):
+        if self.sparse:
+            from scipy.sparse import load_npz
+
+            return load_npz(os.path.join(self.path, file_name + ".npz"))
+        return np.load(os.path.join(self.path, file_name + ".npy"),
+                       mmap_mode="r" if self.mmap else None)
+
+    def __getitem__(self, n):
+        if n not in self.indices:
+            raise KeyError(n)
+        if n not in self._generators:
+            self._generators[n] = GeneratorPowers(self._load(f"sigma_{n}"))
+        return self._generators[n]
+
+    def __iter__(self):
+        return iter(self.indices)
+
+    def __len__(self):
+        return len(self.indices)
+
+    def loaded(self):
+        """
+        indices of the generators read so far.
+        """
+        return sorted(self._generators)
+
+    def __getstate__(self):
+        return {"path": self.path, "indices": self.indices,
+                "sparse": self.sparse, "mmap": self.mmap}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+
+def load_generators(path, mmap=True):
+    """
+    opens the generators and reads the basis stored in the directory path.
+
+    Returns:
+        (GeneratorStore: SIG[n][power], CompactBasis)
+    """
+    with open(os.path.join(path, "manifest.json")) as file:
+        manifest = json.load(file)
+
+    key = manifest["key"]
+    compact_basis = CompactBasis(
+        np.load(os.path.join(path, "basis.npy")),
+        key["n_qudits"], key["qudit_len"])
+
+    sigma = GeneratorStore(path, manifest["indices"],
+                           sparse=key.get("sparse", False), mmap=mmap)
+
+    return sigma, compact_basis
+
+
+def get_generators(model, n_qudits, qudit_len, cache_dir=None, mmap=True,
+                   sparse=False, workers=None):
+    """
+    braiding generators and basis of a register, computed on first use and
+    then read from the cache.
+
+    Inputs:
+        model: str:
+            "fibonacci" or "ising".
+        n_qudits: int:
+            number of qudits.
+        qudit_len: int:
+            number of outcomes representing one qudit.
+        cache_dir: str:
+            root directory of the cache (default CACHE_DIR).
+        mmap: bool:
+            memory-map the stored dense arrays instead of reading them.
+        sparse: bool:
+            store and load the generators as scipy.sparse CSR arrays.
+        workers: int:
+            number of worker processes building missing generators (see
+            parallel_build); None (default) or 1 builds them in the
+            calling process.
+    Returns:
+        (GeneratorStore: SIG[n][power] for n = 1..n_anyons-1 and
+        power = +1/-1, List[dict]: basis)
+    """
+    key = register_key(model, n_qudits, qudit_len, sparse)
+    path = register_dir(model, n_qudits, qudit_len, cache_dir, sparse)
+
+    if not _is_valid(path, key):
+        sigma, compact_basis = build_generators(model, n_qudits, qudit_len,
+                                                sparse, workers)
+        save_generators(path, key, sigma, compact_basis)
+
+    sigma, compact_basis = load_generators(path, mmap=mmap)
+    return sigma, compact_basis.to_basis()
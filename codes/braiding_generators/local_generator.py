@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+r"""
+Local generators
+****************
+
+A braiding generator sigma_n only couples states that agree on the labels
+it leaves unchanged (see BasisIndex.coupled_rows): in a suitable order of
+the basis it is block diagonal, with 1x1 to 3x3 blocks for a generator
+inside a qudit, and small blocks for a generator between two qudits.
+
+'local_generator' module stores a generator as these blocks and the rows
+of the basis they act on. Applying it to a (dim, k) matrix gathers the rows
+of each block, multiplies them by the block and scatters them back, which
+costs O(dim * block * k) instead of O(dim^2 * k).
+"""
+import numpy as np
+
+
+class LocalGenerator:
+    """
+    Block-diagonal braiding generator acting on groups of rows.
+
+    Blocks of equal size are stacked, so a product is one batched matmul
+    per block size:
+        parts = [(rows, blocks), ...]
+        rows: (n_blocks, size) int array, rows of the basis of each block.
+        blocks: (n_blocks, size, size) complex array.
+
+    LocalGenerator @ numpy.array applies the generator, so a dict of local
+    generators can be used as the sigma argument of get_matrix, and
+    LocalGenerator @ LocalGenerator is a LocalGenerator (see compose).
+    """
+
+    def __init__(self, dim, groups, blocks):
+        """
+        Inputs:
+            dim: int:
+                dimension of the fusion space.
+            groups: List[List[int]]:
+                rows of each block, a partition of range(dim).
+            blocks: List[numpy.array]:
+                block of each group, blocks[g][f, i] = sigma[groups[g][f],
+                groups[g][i]].
+        """
+        self.dim = dim
+        by_size = {}
+        for group, block in zip(groups, blocks):
+            by_size.setdefault(len(group), ([], []))
+            by_size[len(group)][0].append(group)
+            by_size[len(group)][1].append(block)
+
+        self.parts = [(np.array(rows, dtype=np.intp).reshape(-1, size),
+                       np.array(block_list, dtype=complex)
+                       .reshape(-1, size, size))
+                      for size, (rows, block_list) in sorted(by_size.items())]
+
+    @classmethod
+    def from_matrix(cls, matrix, groups):
+        """
+        blocks of a dense (or scipy.sparse) generator on the given groups
+        of rows.
+        """
+        if hasattr(matrix, "tocsr"):
+            matrix = matrix.tocsr()
+            blocks = [matrix[group][:, group].toarray() for group in groups]
+        else:
+            matrix = np.asarray(matrix)
+            blocks = [matrix[np.ix_(group, group)] for group in groups]
+
+        return cls(matrix.shape[0], groups, blocks)
+
+    @classmethod
+    def _from_parts(cls, dim, parts):
+        generator = cls.__new__(cls)
+        generator.dim = dim
+        generator.parts = parts
+        return generator
+
+    @property
+    def shape(self):
+        return (self.dim, self.dim)
+
+    def inverse(self):
+        """
+        inverse generator: blocks of a unitary generator are unitary, so
+        each block is conjugate transposed.
+        """
+        return self._from_parts(
+            self.dim, [(rows, blocks.conjugate().transpose(0, 2, 1))
+                       for rows, blocks in self.parts])
+
+    def toarray(self):
+        """
+        dense matrix of the generator.
+        """
+        matrix = np.zeros(self.shape, dtype=complex)
+        for rows, blocks in self.parts:
+            matrix[rows[:, :, None], rows[:, None, :]] = blocks
+        return matrix
+
+    def _same_rows(self, other):
+        return (
+            len(self.parts) == len(other.parts)
+            and all(np.array_equal(rows, other_rows)
+                    for (rows, _), (other_rows, _) in zip(self.parts,
+                                                          other.parts))
+        )
+
+    def apply(self, states):
+        """
+        applies the generator to a vector (dim,) or to the columns of a
+        matrix (dim, k).
+        """
+        states = np.asarray(states)
+        flat = states.reshape(self.dim, -1)
+        result = np.empty(flat.shape, dtype=np.result_type(flat, complex))
+        for rows, blocks in self.parts:
+            result[rows] = blocks @ flat[rows]
+
+        return result.reshape(states.shape)
+
+    def compose(self, other):
+        """
+        product self @ other of generators with different groups: a group
+        of the product is a union of groups of both sharing rows (e.g. the
+        product of the blocks of two commuting generators acting on
+        different labels), so the product stays block diagonal.
+        """
+        from scipy.sparse import coo_array
+        from scipy.sparse.csgraph import connected_components
+
+        # rows coupled by self or other: chains along each group
+        links = [(rows[:, :-1].ravel(), rows[:, 1:].ravel())
+                 for generator in (self, other)
+                 for rows, _ in generator.parts]
+        heads = np.concatenate([head for head, _ in links])
+        tails = np.concatenate([tail for _, tail in links])
+        graph = coo_array((np.ones(len(heads)), (heads, tails)),
+                          shape=self.shape)
+        _, labels = connected_components(graph, directed=False)
+
+        # position of each row in its group, groups stacked by size
+        order = np.argsort(labels, kind="stable")
+        sizes = np.bincount(labels)
+        starts = np.cumsum(sizes) - sizes
+        position = np.empty(self.dim, dtype=np.intp)
+        position[order] = np.arange(self.dim) - starts[labels[order]]
+
+        slot = np.empty(len(sizes), dtype=np.intp)
+        group_rows = {}
+        for size in np.unique(sizes):
+            groups = np.flatnonzero(sizes == size)
+            slot[groups] = np.arange(len(groups))
+            group_rows[size] = order[np.isin(labels[order], groups)] \
+                .reshape(len(groups), size)
+
+        def restricted(generator):
+            # blocks of generator on the groups of the product
+            matrices = {size: np.zeros((len(rows), size, size), dtype=complex)
+                        for size, rows in group_rows.items()}
+            for rows, blocks in generator.parts:
+                group = labels[rows[:, 0]]
+                for size in np.unique(sizes[group]):
+                    select = sizes[group] == size
+                    local = position[rows[select]]
+                    matrices[size][slot[group[select]][:, None, None],
+                                   local[:, :, None],
+                                   local[:, None, :]] = blocks[select]
+            return matrices
+
+        self_blocks = restricted(self)
+        other_blocks = restricted(other)
+
+        return self._from_parts(
+            self.dim, [(group_rows[size],
+                        self_blocks[size] @ other_blocks[size])
+                       for size in sorted(group_rows)])
+
+    def __array__(self, dtype=None, copy=None):
+        matrix = self.toarray()
+        return matrix if dtype is None else matrix.astype(dtype)
+
+    def __matmul__(self, other):
+        if isinstance(other, LocalGenerator):
+            if self._same_rows(other):
+                # powers of one generator keep its blocks
+                return self._from_parts(
+                    self.dim, [(rows, blocks @ other_blocks)
+                               for (rows, blocks), (_, other_blocks)
+                               in zip(self.parts, other.parts)])
+            return self.compose(other)
+
+        return self.apply(other)
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Anyonic models
+**************
+
+Names of the anyonic models whose multi-qudit braiding generators can be
+computed, and the modules that implement them.
+"""
+import codes.braiding_generators.fib_multi_qudits as fib_multi_qudits
+import codes.braiding_generators.ising_multi_qudits as ising_multi_qudits
+
+MODELS = {
+    "fibonacci": fib_multi_qudits,
+    "ising": ising_multi_qudits,
+}
+
+
+def get_model(model):
+    """
+    module implementing an anyonic model.
+
+    Inputs:
+        model: str:
+            name of the model, one of MODELS.
+    Returns:
+        module: fib_multi_qudits or ising_multi_qudits.
+    """
+    if model not in MODELS:
+        raise ValueError(f"Unknown model {model!r}, "
+                         f"expected one of {list(MODELS)}!")
+
+    return MODELS[model]
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+r"""
+Parallel build
+**************
+
+'parallel_build' module computes all the braiding generators
+sigma_1..sigma_{n_anyons-1} of a multi-qudit register in a process pool:
+
+    SIG, compact_basis = build_all_generators("fibonacci", 3, 3, workers=4)
+
+The basis is enumerated once, in the parent process (see register), and
+its compact labels (see compact_basis) are put in a shared memory block
+that every worker attaches to once and builds its Register from, instead
+of enumerating the basis again or receiving a copy with each task.
+
+A task is a generator index and a chunk of the groups of states it couples
+(see BasisIndex.coupled_rows), so the rows of a single large generator are
+computed in parallel too. The parent assembles the components returned by
+the tasks into dense or scipy.sparse CSR generators.
+"""
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from codes.braiding_generators.compact_basis import CompactBasis
+from codes.braiding_generators.basis_index import BasisIndex
+from codes.braiding_generators.register import Register, get_register
+
+# number of matrix components a task computes, at most
+CHUNK_SIZE = 20000
+
+# state of a worker process: shared memory block and register
+_WORKER = {}
+
+
+def _init_worker(model, shm_name, shape, n_qudits, qudit_len):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    labels = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+
+    _WORKER["shm"] = shm
+    _WORKER["register"] = Register(
+        model, n_qudits, qudit_len,
+        basis_index=BasisIndex(labels, n_qudits, qudit_len))
+
+
+def _build_chunk(index, groups):
+    register = _WORKER["register"]
+    _, rows, columns, data = register.module.generator_elements(
+        index, groups, register.basis)
+    return (index, np.array(rows, dtype=np.intp),
+            np.array(columns, dtype=np.intp), np.array(data, dtype=complex))
+
+
+def split_groups(groups, chunk_size=CHUNK_SIZE):
+    """
+    splits groups of coupled states into chunks of at most chunk_size
+    matrix components (a group of b states has b^2 components), keeping
+    each group whole.
+    """
+    chunks = [[]]
+    cost = 0
+    for group in groups:
+        if chunks[-1] and cost + len(group) ** 2 > chunk_size:
+            chunks.append([])
+            cost = 0
+        chunks[-1].append(group)
+        cost += len(group) ** 2
+
+    return chunks
+
+
+def _assemble(dim, rows, columns, data, sparse):
+    if sparse:
+        from scipy.sparse import csr_array
+
+        return csr_array((data, (rows, columns)), shape=(dim, dim))
+
+    sig = np.zeros([dim, dim], dtype=complex)
+    sig[rows, columns] = data
+    return sig
+
+
+def build_all_generators(model, n_qudits, qudit_len, workers=None,
+                         sparse=False, chunk_size=CHUNK_SIZE, register=None):
+    """
+    computes the basis and all the braiding generators of a register in a
+    process pool.
+
+    Inputs:
+        model: str:
+            "fibonacci" or "ising".
+        n_qudits: int:
+            number of qudits.
+        qudit_len: int:
+            number of outcomes representing one qudit.
+        workers: int:
+            number of worker processes; None (default) or 1 builds the
+            generators in the calling process.
+        sparse: bool:
+            returns the generators as scipy.sparse CSR arrays.
+        chunk_size: int:
+            number of matrix components a task computes, at most.
+        register: Register:
+            register whose basis and groups are used (default
+            get_register(model, n_qudits, qudit_len)).
+    Returns:
+        (dict: SIG[n][power] for n = 1..n_anyons-1 and power = +1/-1,
+        CompactBasis)
+    """
+    from codes.braiding_generators.generator_cache import inverse
+
+    if register is None:
+        register = get_register(model, n_qudits, qudit_len)
+    compact_basis = CompactBasis(register.basis_index.labels, n_qudits,
+                                 qudit_len)
+    dim = len(compact_basis)
+    n_anyons = n_qudits * (qudit_len + 1)
+
+    tasks = [(index, chunk)
+             for index in range(1, n_anyons)
+             for chunk in split_groups(register.coupled_states(index),
+                                       chunk_size)]
+
+    elements = {index: ([], [], []) for index in range(1, n_anyons)}
+
+    def collect(result):
+        index, rows, columns, data = result
+        elements[index][0].append(rows)
+        elements[index][1].append(columns)
+        elements[index][2].append(data)
+
+    if workers is None or workers == 1:
+        for index, chunk in tasks:
+            _, rows, columns, data = register.module.generator_elements(
+                index, chunk, register.basis)
+            collect((index, np.array(rows, dtype=np.intp),
+                     np.array(columns, dtype=np.intp),
+                     np.array(data, dtype=complex)))
+    else:
+        labels = np.ascontiguousarray(compact_basis.labels, dtype=np.uint8)
+        shm = shared_memory.SharedMemory(create=True,
+                                         size=max(labels.nbytes, 1))
+        try:
+            np.ndarray(labels.shape, dtype=np.uint8,
+                       buffer=shm.buf)[...] = labels
+            with ProcessPoolExecutor(
+                    max_workers=workers, initializer=_init_worker,
+                    initargs=(model, shm.name, labels.shape, n_qudits,
+                              qudit_len)) as executor:
+                futures = [executor.submit(_build_chunk, index, chunk)
+                           for index, chunk in tasks]
+                for future in futures:
+                    collect(future.result())
+        finally:
+            shm.close()
+            shm.unlink()
+
+    sigma = {}
+    for index, (rows, columns, data) in elements.items():
+        gen = _assemble(dim, np.concatenate(rows), np.concatenate(columns),
+                        np.concatenate(data), sparse)
+        sigma[index] = {1: gen, -1: inverse(gen)}
+
+    return sigma, compact_basis
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+r"""
+Register
+********
+
+'register' module holds the state shared by the braiding generators of a
+multi-qudit register, so it is computed once and not for every generator:
+    + basis of the fusion space (list of dicts, and its BasisIndex),
+    + groups of coupled states of each generator.
+
+    register = Register("fibonacci", 3, 3)
+    sigma_4 = register.generator(4)
+    SIG = register.generators()         # SIG[n][power], for get_matrix
+
+A register pickles as its model and shape and is rebuilt by
+get_basis_index when unpickled. The worker processes of parallel_build
+build their register from the basis labels in shared memory instead.
+"""
+from functools import lru_cache
+from codes.braiding_generators.basis_index import get_basis_index
+from codes.braiding_generators.models import get_model
+
+
+class Register:
+    """
+    Multi-qudit register of an anyonic model.
+    """
+
+    def __init__(self, model, n_qudits, qudit_len, basis_index=None):
+        """
+        Inputs:
+            model: str:
+                "fibonacci" or "ising".
+            n_qudits: int:
+                number of qudits.
+            qudit_len: int:
+                number of outcomes representing one qudit.
+            basis_index: BasisIndex:
+                index of the basis (default get_basis_index(model,
+                n_qudits, qudit_len)).
+        """
+        self.model = model
+        self.n_qudits = n_qudits
+        self.qudit_len = qudit_len
+
+        self.module = get_model(model)
+
+        if basis_index is None:
+            basis_index = get_basis_index(model, n_qudits, qudit_len)
+        self.basis_index = basis_index
+        self.basis = self.basis_index.to_basis()
+        self._groups = {}
+
+    @property
+    def n_anyons(self):
+        return self.n_qudits * (self.qudit_len + 1)
+
+    def __len__(self):
+        return len(self.basis)
+
+    def __repr__(self):
+        return (f"Register({self.model!r}, {self.n_qudits}, "
+                f"{self.qudit_len})")
+
+    def coupled_states(self, index):
+        """
+        groups of states that the braiding generator sigma_{index} can
+        couple (see BasisIndex.coupled_rows), computed once per index.
+        """
+        if index not in self._groups:
+            self._groups[index] = self.basis_index.coupled_rows(index)
+        return self._groups[index]
+
+    def generator(self, index, sparse=False, inverse=False, local=False):
+        """
+        braiding generator sigma_{index} of the register (see
+        braiding_generator of the model module).
+        """
+        return self.module.braiding_generator(
+            index, self.n_qudits, self.qudit_len, show=False, sparse=sparse,
+            inverse=inverse, local=local, register=self)[0]
+
+    def generators(self, sparse=False, workers=None):
+        """
+        all the braiding generators of the register.
+
+        Inputs:
+            sparse: bool:
+                returns the generators as scipy.sparse CSR arrays.
+            workers: int:
+                number of worker processes (see parallel_build); None
+                (default) or 1 builds the generators in the calling
+                process.
+        Returns:
+            dict: SIG[n][power] for n = 1..n_anyons-1 and power = +1/-1.
+        """
+        if workers is not None and workers > 1:
+            from codes.braiding_generators.parallel_build import (
+                build_all_generators,
+            )
+
+            return build_all_generators(self.model, self.n_qudits,
+                                        self.qudit_len, workers=workers,
+                                        sparse=sparse, register=self)[0]
+
+        from codes.braiding_generators.generator_cache import inverse
+
+        sigma = {}
+        for n in range(1, self.n_anyons):
+            gen = self.generator(n, sparse=sparse)
+            sigma[n] = {1: gen, -1: inverse(gen)}
+
+        return sigma
+
+    def __getstate__(self):
+        return {"model": self.model, "n_qudits": self.n_qudits,
+                "qudit_len": self.qudit_len}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+
+@lru_cache(maxsize=None)
+def get_register(model, n_qudits, qudit_len):
+    """
+    register of a model and shape, built once per
+    (model, n_qudits, qudit_len).
+    """
+    return Register(model, n_qudits, qudit_len)
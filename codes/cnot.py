@@ -1,12 +1,11 @@
 """
 Reproduce Bonesteel CNOT gate.
 """
-import pickle
 import numpy as np
 
 from codes.braid_matrix_calculator import error_distance, get_matrix, leakage_error
 from codes.transformer import uncouple, time_mirror, uncouple_all
-import codes.braiding_generators.fib_multi_qudits as multi_q
+from codes.braiding_generators.generator_cache import get_generators
 from codes.matrix_tools import extract, combine_diag
 from codes.cplot import cplot, scale
 
@@ -47,28 +46,7 @@ sequence =  {'sigma': [3, 4, 4, 3, 3, 4, 2, 3, 3, 2, 4, 3, 3, 4, 2, 3, 3, 2, 4,
                        1, 1, 1, 1, -1, -1, -1, -1, -1, -1]}
 
 # Calculate sigmas of 2 qubits (3 anyons per qubit)
-try:
-    with open("bin/basis-2q-6a.pickle", "rb") as file:
-        basis = pickle.load(file)
-
-    with open("bin/SIG-2q-6a.pickle", "rb") as file:
-        SIG = pickle.load(file)
-
-except FileNotFoundError:
-    SIG = {}
-    for index in range(5):
-        n = index + 1
-        SIG[n] = {}
-        gen = multi_q.braiding_generator(n, 2, 2, show=False)
-
-        SIG[n][1] = np.array(gen[0])
-        SIG[n][-1] = np.array(np.linalg.inv(gen[0]))
-
-    basis = gen[1]
-    with open("bin/basis-2q-6a.pickle", "wb") as file:
-        pickle.dump(basis, file)
-    with open("bin/SIG-2q-6a.pickle", "wb") as file:
-        pickle.dump(SIG, file)
+SIG, basis = get_generators("fibonacci", 2, 2)
 
 #
 # Calculate matrix representation of C-NOT braiding sequance
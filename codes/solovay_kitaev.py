@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+r"""
+Solovay-Kitaev compiler
+***********************
+
+'solovay_kitaev' module compiles a single-qubit gate into a braid seq of
+the three-anyon generators braid_matrix_calculator.EX_SIGMA:
+
+    seq = compile_gate(target, depth=2)
+    w = get_matrix(seq)     # target up to a global phase
+
+The base approximations are the nearest braids (see su2_index) in a table
+of all the braids of at most max_runs runs sigma_{i}^{p} (i alternating,
+p in BASE_POWERS), stored once in the cache directory
+(generator_cache.CACHE_DIR):
+
+    bin/sk-base-<max_runs>r-<hash>.npz
+
+Each recursion level writes the remaining error U @ U_{n-1}^dagger as a
+balanced group commutator V W V^dagger W^dagger (Dawson and Nielsen) and
+approximates V and W at the previous level, which multiplies the length of
+the seq by 5 and reduces the error to O(error^{3/2}).
+
+All the unitaries are handled in SU(2) (divided by a square root of their
+determinant) and compared up to their sign, as in error_distance.
+"""
+import os
+import json
+import hashlib
+import tempfile
+import numpy as np
+from functools import lru_cache
+from typing import Dict, Tuple
+from codes.braid_matrix_calculator import EX_SIGMA, generator_power
+from codes.braiding_generators.generator_cache import CACHE_DIR
+from codes.su2_index import SU2Index
+
+# sigma_i^10 is a global phase: these are all the powers up to the phase
+BASE_POWERS = (-4, -3, -2, -1, 1, 2, 3, 4, 5)
+
+# Bump when the stored table changes
+TABLE_VERSION = 1
+
+PAULI = (np.array([[0, 1], [1, 0]], dtype=complex),
+         np.array([[0, -1j], [1j, 0]], dtype=complex),
+         np.array([[1, 0], [0, -1]], dtype=complex))
+
+
+def special_unitary(unitary: "np.ndarray") -> "np.ndarray":
+    """
+    unitary, or (N, 2, 2) stack of unitaries, divided by a square root of
+    the determinant.
+    """
+    # complex: the determinant of a real unitary can be negative
+    unitary = np.asarray(unitary, dtype=complex)
+    return unitary / np.sqrt(np.linalg.det(unitary))[..., None, None]
+
+
+def table_path(max_runs, cache_dir=None):
+    """
+    content-addressed file of the base table.
+    """
+    key = {"max_runs": max_runs, "powers": list(BASE_POWERS),
+           "version": TABLE_VERSION}
+    digest = hashlib.sha256(
+        json.dumps(key, sort_keys=True).encode()).hexdigest()[:16]
+    return os.path.join(cache_dir or CACHE_DIR,
+                        f"sk-base-{max_runs}r-{digest}.npz")
+
+
+def build_base_table(max_runs, sigma=0):
+    """
+    all the braids of at most max_runs runs, breadth first: the braids of
+    k + 1 runs are the braids of k runs followed by a run of the other
+    sigma, one stacked matmul per power.
+
+    Returns:
+        dict:
+            'runs': (N, max_runs) int array of the powers, 0 padded.
+            's0': (N,) int array of the first sigma index.
+            'unitaries': (N, 2, 2) special unitaries of the braids.
+    """
+    if sigma == 0:
+        sigma = EX_SIGMA
+
+    # run_unitary[index - 1, p] = sigma_{index}^{BASE_POWERS[p]} in SU(2)
+    run_unitary = special_unitary(np.array(
+        [[generator_power(sigma, index, power) for power in BASE_POWERS]
+         for index in (1, 2)], dtype=complex))
+    n_powers = len(BASE_POWERS)
+
+    runs = np.repeat(np.array(BASE_POWERS), 2)[:, None]
+    s0 = np.tile([1, 2], n_powers)
+    last = s0.copy()
+    stack = run_unitary[s0 - 1, np.repeat(np.arange(n_powers), 2)]
+
+    levels = [(runs, s0, stack)]
+    for _ in range(1, max_runs):
+        following = 3 - last
+        runs = np.concatenate(
+            [np.column_stack([runs, np.full(len(runs), power)])
+             for power in BASE_POWERS])
+        stack = np.concatenate(
+            [run_unitary[following - 1, p] @ stack for p in range(n_powers)])
+        s0 = np.tile(s0, n_powers)
+        last = np.tile(following, n_powers)
+        levels.append((runs, s0, stack))
+
+    identity = (np.zeros((1, max_runs), dtype=int), np.array([1]),
+                np.eye(2, dtype=complex)[None])
+    return {
+        "runs": np.concatenate(
+            [np.pad(level_runs, ((0, 0), (0, max_runs - level_runs.shape[1])))
+             for level_runs, _, _ in [identity] + levels]).astype(np.int8),
+        "s0": np.concatenate([level_s0 for _, level_s0, _ in
+                              [identity] + levels]).astype(np.int8),
+        "unitaries": np.concatenate([level_stack for _, _, level_stack in
+                                     [identity] + levels]),
+    }
+
+
+def load_base_table(max_runs, cache_dir=None):
+    """
+    base table of at most max_runs runs, built on first use and then read
+    from the cache.
+    """
+    path = table_path(max_runs, cache_dir)
+    if not os.path.isfile(path):
+        table = build_base_table(max_runs)
+        parent = os.path.dirname(os.path.abspath(path))
+        os.makedirs(parent, exist_ok=True)
+        file_descriptor, tmp_path = tempfile.mkstemp(dir=parent,
+                                                     prefix=".tmp-",
+                                                     suffix=".npz")
+        try:
+            with os.fdopen(file_descriptor, "wb") as file:
+                np.savez(file, **table)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    with np.load(path) as file:
+        return {name: file[name] for name in file.files}
+
+
+def _inverse(seq: Dict) -> Dict:
+    return {"sigma": seq["sigma"][::-1],
+            "power": [-power for power in seq["power"][::-1]]}
+
+
+def _concat(*seqs: Dict) -> Dict:
+    """seqs applied one after the other, chronology from left to right"""
+    return {"sigma": [index for seq in seqs for index in seq["sigma"]],
+            "power": [power for seq in seqs for power in seq["power"]]}
+
+
+def axis_angle(special: "np.ndarray") -> Tuple["np.ndarray", float]:
+    """
+    rotation axis n and angle theta in [0, pi] of an SU(2) matrix, up to
+    its sign: special = +-(cos(theta/2) I - i sin(theta/2) n.sigma).
+    """
+    cosine = np.trace(special).real / 2
+    if cosine < 0:
+        special, cosine = -special, -cosine
+
+    vector = np.array([(1j * np.trace(special @ pauli) / 2).real
+                       for pauli in PAULI])
+    norm = np.linalg.norm(vector)
+    if norm < 1e-15:
+        return np.array([0.0, 0.0, 1.0]), 0.0
+
+    return vector / norm, 2 * np.arccos(min(cosine, 1.0))
+
+
+def rotation(axis, angle) -> "np.ndarray":
+    """
+    SU(2) rotation cos(angle/2) I - i sin(angle/2) axis.sigma.
+    """
+    return (np.cos(angle / 2) * np.eye(2)
+            - 1j * np.sin(angle / 2)
+            * sum(component * pauli for component, pauli in zip(axis, PAULI)))
+
+
+def group_commutator(special: "np.ndarray"):
+    """
+    balanced group commutator decomposition: V, W of rotation angle phi
+    with V W V^dagger W^dagger = special (up to its sign), where
+    sin(theta/2) = 2 sin^2(phi/2) sqrt(1 - sin^4(phi/2)).
+    """
+    axis, theta = axis_angle(special)
+    phi = 2 * np.arcsin(((1 - np.cos(theta / 2)) / 2) ** 0.25)
+
+    v = rotation([1, 0, 0], phi)
+    w = rotation([0, 1, 0], phi)
+    commutator_axis, _ = axis_angle(v @ w @ v.conjugate().T @ w.conjugate().T)
+
+    # rotation s of the commutator axis onto the axis of special
+    normal = np.cross(commutator_axis, axis)
+    if np.linalg.norm(normal) < 1e-12:
+        if np.dot(commutator_axis, axis) > 0:
+            s = np.eye(2)
+        else:
+            normal = np.cross(commutator_axis, [1, 0, 0])
+            if np.linalg.norm(normal) < 1e-12:
+                normal = np.cross(commutator_axis, [0, 1, 0])
+            s = rotation(normal / np.linalg.norm(normal), np.pi)
+    else:
+        s = rotation(normal / np.linalg.norm(normal),
+                     np.arccos(np.clip(np.dot(commutator_axis, axis), -1, 1)))
+
+    return s @ v @ s.conjugate().T, s @ w @ s.conjugate().T
+
+
+class SolovayKitaev:
+    """
+    Solovay-Kitaev compiler over a base table of braids.
+
+    Example:
+        compiler = SolovayKitaev(max_runs=5)
+        seq = compiler.compile(target, depth=2)
+    """
+
+    def __init__(self, max_runs=5, cache_dir=None):
+        """
+        Inputs:
+            max_runs: int:
+                maximal number of runs of the braids of the base table.
+            cache_dir: str:
+                root directory of the cache (default CACHE_DIR).
+        """
+        self.max_runs = max_runs
+        self.table = load_base_table(max_runs, cache_dir)
+        self.index = SU2Index(self.table["unitaries"])
+
+    def base_seq(self, row) -> Dict:
+        """
+        braid seq of a row of the base table.
+        """
+        s0 = int(self.table["s0"][row])
+        powers = [int(power) for power in self.table["runs"][row] if power]
+        return {"sigma": [s0 if ii % 2 == 0 else 3 - s0
+                          for ii in range(len(powers))],
+                "power": powers}
+
+    def basic_approximation(self, special) -> Tuple[Dict, "np.ndarray"]:
+        """
+        closest braid of the base table to an SU(2) matrix.
+        """
+        row = int(self.index.query(special)[1][0])
+        return self.base_seq(row), self.table["unitaries"][row]
+
+    def approximate(self, special, depth) -> Tuple[Dict, "np.ndarray"]:
+        """
+        Solovay-Kitaev approximation of an SU(2) matrix.
+
+        Returns:
+            (dict: braid seq, numpy.array: its SU(2) matrix)
+        """
+        if depth == 0:
+            return self.basic_approximation(special)
+
+        seq, approx = self.approximate(special, depth - 1)
+        v, w = group_commutator(special @ approx.conjugate().T)
+        v_seq, v_approx = self.approximate(v, depth - 1)
+        w_seq, w_approx = self.approximate(w, depth - 1)
+
+        # V W V^dagger W^dagger U_{n-1}, chronology from left to right
+        seq = _concat(seq, _inverse(w_seq), _inverse(v_seq), w_seq, v_seq)
+        approx = (v_approx @ w_approx @ v_approx.conjugate().T
+                  @ w_approx.conjugate().T @ approx)
+
+        return seq, approx
+
+    def compile(self, target, depth=2) -> Dict:
+        """
+        braid seq approximating a 2x2 unitary up to a global phase.
+        """
+        return self.approximate(special_unitary(target), depth)[0]
+
+
+@lru_cache(maxsize=None)
+def get_compiler(max_runs=5, cache_dir=None):
+    """
+    compiler of a base table, loaded once per (max_runs, cache_dir).
+    """
+    return SolovayKitaev(max_runs, cache_dir)
+
+
+def compile_gate(target: "np.ndarray", depth=2, max_runs=5,
+                 cache_dir=None) -> Dict:
+    """
+    compiles a single-qubit gate into a braid seq of EX_SIGMA.
+
+    Inputs:
+        target: numpy.array:
+            2x2 unitary, defined up to a global phase.
+        depth: int:
+            recursion depth, 0 for the closest braid of the base table.
+        max_runs: int:
+            maximal number of runs of the braids of the base table.
+        cache_dir: str:
+            root directory of the cache (default CACHE_DIR).
+    Returns:
+        dict: 'sigma' and 'power' lists, chronology from left to right,
+        accepted by get_matrix.
+    """
+    return get_compiler(max_runs, cache_dir).compile(target, depth)
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+r"""
+SU(2) index
+***********
+
+'su2_index' module answers "closest braid to U" queries over a table of
+2x2 unitaries, e.g. the weaves of weave_search or the base table of
+solovay_kitaev.
+
+A unitary is embedded as the unit quaternion (Re a, Im a, Re b, Im b) of
+
+    U / sqrt(det U) = [[a, b], [-b*, a*]],
+
+defined up to its sign (the global phase). For two SU(2) matrices, the
+spectral norm of their difference is the Euclidean distance of their
+quaternions, so
+
+    error_distance(U_1, U_2) = min(|q_1 - q_2|, |q_1 + q_2|)
+
+and nearest neighbours for error_distance are nearest neighbours in R^4
+among the points q and -q, found with a scipy k-d tree.
+"""
+import numpy as np
+from typing import List, Tuple
+
+
+def su2_coordinates(stack: "np.ndarray") -> "np.ndarray":
+    """
+    unit quaternions (Re a, Im a, Re b, Im b) of a (N, 2, 2) stack of
+    unitaries divided by a square root of their determinant, so that
+    U / sqrt(det U) = [[a, b], [-b*, a*]].
+
+    The quaternion of a unitary is defined up to its sign, and the error
+    distance of two unitaries is min(|q_1 - q_2|, |q_1 + q_2|).
+    """
+    # complex: the determinant of a real unitary can be negative
+    stack = np.asarray(stack, dtype=complex)
+    special = stack / np.sqrt(np.linalg.det(stack))[:, None, None]
+
+    return np.stack([special[:, 0, 0].real, special[:, 0, 0].imag,
+                     special[:, 0, 1].real, special[:, 0, 1].imag], axis=1)
+
+
+class SU2Index:
+    """
+    Nearest-neighbour index of a table of 2x2 unitaries for the error
+    distance.
+
+    Example:
+        index = SU2Index(stack)             # (N, 2, 2) unitaries
+        distances, rows = index.query(targets)
+        index.save("bin/weaves.npz")
+        index = SU2Index.load("bin/weaves.npz")
+
+    An index pickles as its points; the tree is rebuilt on unpickling.
+    """
+
+    def __init__(self, unitaries=None, points=None):
+        """
+        Inputs:
+            unitaries: numpy.array:
+                (N, 2, 2) stack of unitaries, defined up to global phases.
+            points: numpy.array:
+                (N, 4) quaternions of the unitaries, instead of unitaries.
+        """
+        from scipy.spatial import cKDTree
+
+        if points is None:
+            points = su2_coordinates(unitaries)
+        self.points = np.asarray(points, dtype=float).reshape(-1, 4)
+
+        # q and -q are the same unitary: both are indexed
+        self.tree = cKDTree(np.concatenate([self.points, -self.points]))
+
+    def __len__(self):
+        return len(self.points)
+
+    def _query_points(self, unitaries):
+        unitaries = np.asarray(unitaries)
+        return su2_coordinates(unitaries.reshape(-1, 2, 2))
+
+    def query(self, unitaries, k=1, eps=0.0
+              ) -> Tuple["np.ndarray", "np.ndarray"]:
+        """
+        k nearest rows of the table to each unitary.
+
+        Inputs:
+            unitaries: numpy.array:
+                2x2 unitary or (M, 2, 2) stack.
+            k: int:
+                number of neighbours.
+            eps: float:
+                approximate search: the k-th neighbour returned is within
+                (1 + eps) times the distance of the true k-th neighbour.
+        Returns:
+            (numpy.array: error distances, numpy.array: rows), of shape
+            (M,) for k = 1 and (M, k) otherwise, closest first.
+        """
+        queries = self._query_points(unitaries)
+        k = min(k, len(self))
+
+        if k == 1:
+            distances, hits = self.tree.query(queries, k=1, eps=eps)
+            return distances, hits % len(self)
+
+        # the neighbours of q and -q of the same row are deduplicated
+        distances, hits = self.tree.query(queries, k=2 * k, eps=eps)
+        result_distances = np.empty((len(queries), k))
+        result_rows = np.empty((len(queries), k), dtype=np.intp)
+        for ii in range(len(queries)):
+            rows, first = np.unique(hits[ii] % len(self), return_index=True)
+            order = np.argsort(first)[:k]
+            result_rows[ii] = rows[order]
+            result_distances[ii] = distances[ii][first[order]]
+
+        return result_distances, result_rows
+
+    def query_radius(self, unitaries, r) -> List[Tuple["np.ndarray",
+                                                       "np.ndarray"]]:
+        """
+        rows of the table within the error distance r of each unitary.
+
+        Returns:
+            List[(numpy.array: error distances, numpy.array: rows)]: one
+            pair per unitary, rows in increasing order.
+        """
+        queries = self._query_points(unitaries)
+
+        results = []
+        for query, hits in zip(queries,
+                               self.tree.query_ball_point(queries, r=r)):
+            hits = np.asarray(hits, dtype=np.intp)
+            distances = np.linalg.norm(self.tree.data[hits] - query, axis=1)
+            rows = hits % len(self)
+
+            # a row matched by q and -q keeps its closest point
+            order = np.lexsort((distances, rows))
+            rows, first = np.unique(rows[order], return_index=True)
+            results.append((distances[order][first], rows))
+
+        return results
+
+    def save(self, path):
+        """
+        writes the points of the index to a .npz file.
+        """
+        np.savez(path, points=self.points)
+
+    @classmethod
+    def load(cls, path):
+        """
+        index of the points stored by save.
+        """
+        with np.load(path) as file:
+            return cls(points=file["points"])
+
+    def __getstate__(self):
+        return {"points": self.points}
+
+    def __setstate__(self, state):
+        self.__init__(points=state["points"])
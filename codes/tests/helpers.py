@@ -0,0 +1,27 @@
+"""
+Helpers shared by the tests.
+"""
+import numpy as np
+
+PAULI = [np.array([[1, 0], [0, 1]]) * (1 + 0j),
+         np.array([[1, 0], [0, -1]]) * (-1j),
+         np.array([[0, 1], [1, 0]]) * (-1j),
+         np.array([[0, 1j], [-1j, 0]]) * (-1j)]
+
+
+def random_special_unitary():
+    """ generate random SU(2) unitary matrix, uniformly (Haar) """
+    coef = np.random.normal(size=4)
+    coef /= np.linalg.norm(coef)
+    unitary = np.zeros([2, 2]) + 0j
+    for __ in range(4):
+        unitary += coef[__] * PAULI[__]
+    return unitary
+
+
+def su2_distance(unitary_1, unitary_2):
+    """ error distance of two 2x2 unitaries, up to global phases """
+    special_1 = unitary_1 / np.sqrt(complex(np.linalg.det(unitary_1)))
+    special_2 = unitary_2 / np.sqrt(complex(np.linalg.det(unitary_2)))
+    return min(np.linalg.norm(special_1 - special_2, 2),
+               np.linalg.norm(special_1 + special_2, 2))
@@ -0,0 +1,57 @@
+import numpy as np
+from codes.braiding_generators.basis_index import (
+    BasisIndex,
+    get_basis_index
+)
+import codes.braiding_generators.fib_multi_qudits as fib_multi
+import codes.braiding_generators.ising_multi_qudits as ising_multi
+
+
+def test_get_basis_index():
+    """ """
+    basis_index = get_basis_index("fibonacci", 3, 3)
+    assert basis_index is get_basis_index("fibonacci", 3, 3)
+    assert basis_index.to_basis() == fib_multi.find_basis(3, 3)
+    assert get_basis_index("ising", 2, 3).to_basis() == \
+        ising_multi.find_basis(2, 3)
+
+
+def test_rows():
+    """ """
+    basis = fib_multi.find_basis(3, 3)
+    basis_index = BasisIndex.from_basis(basis)
+
+    rows = basis_index.rows({(0, 2): 0, (1, 2): 0, (2, -1): 0})
+    assert list(rows) == [
+        row for row, state in enumerate(basis)
+        if all(qudit[2] == 0 for qudit in state["qudits"])]
+    assert len(rows) == 8
+
+    for charge in [0, 1]:
+        assert list(basis_index.rows(charge=charge)) == [
+            row for row, state in enumerate(basis)
+            if state["roots"][-1] == charge]
+
+    assert len(basis_index.rows()) == len(basis)
+
+
+def test_coupled_rows():
+    """ """
+    for module in [fib_multi, ising_multi]:
+        basis = module.find_basis(3, 2)
+        basis_index = BasisIndex.from_basis(basis)
+        for index in range(1, 9):
+            groups = basis_index.coupled_rows(index)
+            assert sorted(row for group in groups for row in group) == \
+                list(range(len(basis)))
+
+            # sigma_{index} vanishes between groups
+            group_of = {}
+            for gg, group in enumerate(groups):
+                for row in group:
+                    group_of[row] = gg
+            for f, state_f in enumerate(basis):
+                for i, state_i in enumerate(basis):
+                    if group_of[f] != group_of[i]:
+                        assert np.isclose(
+                            module.sigma(index, state_f, state_i), 0)
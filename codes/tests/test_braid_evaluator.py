@@ -0,0 +1,66 @@
+import numpy as np
+from codes.braid_matrix_calculator import get_matrix
+from codes.braid_evaluator import BraidWordEvaluator, evaluate_words
+from codes.weave_search import weave_to_seq, enumerate_weaves
+
+
+def random_word(length):
+    """ """
+    return {"sigma": list(np.random.randint(1, 3, size=length)),
+            "power": list(np.random.choice([-1, 1], size=length))}
+
+
+def test_braid_word_evaluator():
+    """ """
+    for length in [0, 1, 7, 32, 45]:
+        seq = random_word(length)
+        evaluator = BraidWordEvaluator(seq)
+        np.testing.assert_allclose(evaluator.matrix(), get_matrix(seq),
+                                   rtol=1e-10, atol=1e-10)
+
+        for _ in range(min(length, 5)):
+            position = np.random.randint(length)
+            index, power = np.random.randint(1, 3), np.random.choice([-1, 1])
+            evaluator.set_letter(position, index, power)
+            seq["sigma"][position] = index
+            seq["power"][position] = power
+            np.testing.assert_allclose(evaluator.matrix(), get_matrix(seq),
+                                       rtol=1e-10, atol=1e-10)
+
+        for start, stop in [(0, length), (length // 3, length // 2 + 1)]:
+            sub_seq = {"sigma": seq["sigma"][start:stop],
+                       "power": seq["power"][start:stop]}
+            np.testing.assert_allclose(evaluator.product(start, stop),
+                                       get_matrix(sub_seq),
+                                       rtol=1e-10, atol=1e-10)
+
+
+def test_evaluate_words():
+    """ """
+    prefix = random_word(20)
+    words = [random_word(5), prefix]
+    for _ in range(5):
+        suffix = random_word(np.random.randint(0, 6))
+        words.append({"sigma": prefix["sigma"] + suffix["sigma"],
+                      "power": prefix["power"] + suffix["power"]})
+
+    for word, matrix in zip(words, evaluate_words(words)):
+        np.testing.assert_allclose(matrix, get_matrix(word),
+                                   rtol=1e-10, atol=1e-10)
+
+
+def test_weave_words():
+    """ """
+    seq = weave_to_seq([2, -4, 2], 1)
+    evaluator = BraidWordEvaluator(seq)
+    np.testing.assert_allclose(evaluator.matrix(), get_matrix(seq),
+                               rtol=1e-10, atol=1e-10)
+    evaluator.set_letter(1, 2, 4)
+    np.testing.assert_allclose(evaluator.matrix(),
+                               get_matrix(weave_to_seq([2, 4, 2], 1)),
+                               rtol=1e-10, atol=1e-10)
+
+    words = [weave_to_seq(weave, 2) for weave in enumerate_weaves(3)]
+    for word, matrix in zip(words, evaluate_words(words)):
+        np.testing.assert_allclose(matrix, get_matrix(word),
+                                   rtol=1e-10, atol=1e-10)
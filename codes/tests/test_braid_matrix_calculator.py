@@ -1,28 +1,21 @@
 import numpy as np
+import codes.braiding_generators.fib_multi_qudits as fib_multi
 from codes.braid_matrix_calculator import (
     error_distance,
+    error_distance_batch,
+    spectral_norm,
     leakage_error,
-    get_matrix
+    leakage_error_batch,
+    fold_powers,
+    commuting_layers,
+    generator_power,
+    get_matrix,
+    get_matrix_batch,
+    get_submatrix,
+    propagate,
+    EX_SIGMA
     )
-
-
-PAULI = [np.array([[1, 0], [0, 1]]) * (1 + 0j),
-         np.array([[1, 0], [0, -1]]) * (-1j),
-         np.array([[0, 1], [1, 0]]) * (-1j),
-         np.array([[0, 1j], [-1j, 0]]) * (-1j)]
-
-
-def random_special_unitary():
-    """ genrate random SU(2) unitary matrix """
-    coef = [0, 0, 0, 0]
-    coef[0] = np.random.rand()
-    coef[1] = np.random.rand() * np.sqrt(1 - coef[0]**2)
-    coef[2] = np.random.rand() * np.sqrt(1 - coef[0]**2 - coef[1]**2)
-    coef[3] = np.sqrt(1 - coef[0]**2 - coef[1]**2 - coef[2]**2)
-    unitary = np.zeros([2, 2]) + 0j
-    for __ in range(4):
-        unitary += coef[__] * PAULI[__]
-    return unitary
+from codes.tests.helpers import PAULI, random_special_unitary
 
 
 def test_error_distance():
@@ -86,3 +79,177 @@ def test_get_matrix():
     np.testing.assert_allclose(get_matrix(seq),
                                np.array([[1, 0], [0, 1]]),
                                rtol=1e-10, atol=1e-10)
+
+
+def test_fold_powers():
+    """ """
+    assert fold_powers({"sigma": [1, 1, 2, 2, 2, 1],
+                        "power": [1, 1, 1, -1, 1, -1]}) == \
+        [(1, 2), (2, 1), (1, -1)]
+    assert fold_powers({"sigma": [1, 2, 2, 1], "power": [1, 1, -1, 1]}) == \
+        [(1, 2)]
+    assert fold_powers({"sigma": [], "power": []}) == []
+
+
+def test_generator_power():
+    """ """
+    powers = {}
+    for power in [3, -2, 1, -4]:
+        expected = np.eye(2)
+        for _ in range(abs(power)):
+            expected = EX_SIGMA[2][1 if power > 0 else -1] @ expected
+        np.testing.assert_allclose(generator_power(EX_SIGMA, 2, power, powers),
+                                   expected, rtol=1e-10, atol=1e-10)
+    assert sorted(powers) == [(2, -4), (2, -3), (2, -2), (2, -1),
+                              (2, 1), (2, 2), (2, 3)]
+
+    # folded evaluation agrees with letter by letter products
+    seq = {"sigma": [1, 1, 2, 2, 2, 2, 1, 2, 2],
+           "power": [1, 1, -1, -1, -1, -1, 1, 1, -1]}
+    expected = np.eye(2)
+    for index, power in zip(seq["sigma"], seq["power"]):
+        expected = EX_SIGMA[index][power] @ expected
+    np.testing.assert_allclose(get_matrix(seq), expected,
+                               rtol=1e-10, atol=1e-10)
+
+
+def test_commuting_layers():
+    """ """
+    assert commuting_layers({"sigma": [1, 3, 2, 1, 4],
+                             "power": [1, 1, 1, -1, 1]}) == \
+        [[(1, 1), (3, 1)], [(2, 1), (4, 1)], [(1, -1)]]
+    assert commuting_layers({"sigma": [1, 3, 1, 3],
+                             "power": [1, 1, 1, -1]}) == [[(1, 2)]]
+
+    # layered evaluation agrees with the plain one on 6 anyons
+    sigmas = {}
+    for index in range(1, 6):
+        gen = fib_multi.braiding_generator(index, 2, 2, show=False)[0]
+        sigmas[index] = {1: gen, -1: gen.conjugate().T}
+    for _ in range(3):
+        seq = {"sigma": list(np.random.randint(1, 6, size=40)),
+               "power": list(np.random.choice([-1, 1], size=40))}
+        np.testing.assert_allclose(get_matrix(seq, sigmas, layered=True),
+                                   get_matrix(seq, sigmas),
+                                   rtol=1e-10, atol=1e-10)
+
+
+def test_propagate():
+    """ """
+    sigmas = {}
+    for index in range(1, 6):
+        gen = fib_multi.braiding_generator(index, 2, 2, show=False)[0]
+        sigmas[index] = {1: gen, -1: gen.conjugate().T}
+    seq = {"sigma": list(np.random.randint(1, 6, size=30)),
+           "power": list(np.random.choice([-1, 1], size=30))}
+    matrix = get_matrix(seq, sigmas)
+
+    state = np.random.rand(matrix.shape[0]) + 0j
+    np.testing.assert_allclose(propagate(seq, state, sigmas), matrix @ state,
+                               rtol=1e-10, atol=1e-10)
+
+    rows = [0, 2, 5]
+    np.testing.assert_allclose(get_submatrix(seq, rows, sigmas),
+                               matrix[np.ix_(rows, rows)],
+                               rtol=1e-10, atol=1e-10)
+
+
+def test_get_matrix_batch():
+    """ """
+    words = [{"sigma": list(np.random.randint(1, 3, size=length)),
+              "power": list(np.random.choice([-2, -1, 1, 2], size=length))}
+             for length in [0, 3, 5, 5, 8, 3]]
+    stack = get_matrix_batch(words)
+    assert stack.shape == (len(words), 2, 2)
+    for word, matrix in zip(words, stack):
+        np.testing.assert_allclose(matrix, get_matrix(word),
+                                   rtol=1e-10, atol=1e-10)
+
+
+def reference_error_distance(unitary_1, unitary_2):
+    """ error_distance with eigen-decompositions, over all the branches """
+    dim = unitary_1.shape[0]
+    phase_1 = complex(np.linalg.det(unitary_1)) ** (1 / dim)
+    phase_2 = complex(np.linalg.det(unitary_2)) ** (1 / dim)
+    error = 2
+    for order in range(dim):
+        diff = (unitary_1 / phase_1
+                - np.exp(2j * np.pi * order / dim) * unitary_2 / phase_2)
+        error = min(error, abs(max(np.linalg.eig(
+            diff.conjugate().T @ diff)[0]) ** (1 / 2)))
+    return error
+
+
+def test_spectral_norm():
+    """ """
+    for dim in range(2, 5):
+        stack = (np.random.rand(6, dim, dim)
+                 + 1j * np.random.rand(6, dim, dim))
+        expected = [np.linalg.svd(matrix, compute_uv=False)[0]
+                    for matrix in stack]
+        np.testing.assert_allclose(spectral_norm(stack), expected,
+                                   rtol=1e-10)
+        np.testing.assert_allclose(spectral_norm(stack[0]), expected[0],
+                                   rtol=1e-10)
+
+    # differences of SU(2) matrices, whose singular values are equal
+    np.random.seed(5)
+    unitaries = np.array([random_special_unitary() for _ in range(40)])
+    # small rotations exp(-i eps Z)
+    rotations = np.array([np.cos(eps) * PAULI[0] + np.sin(eps) * PAULI[1]
+                          for eps in np.logspace(-6, -1, 40)])
+    near = unitaries @ rotations
+    stack = np.concatenate([unitaries[:20] - unitaries[20:],
+                            unitaries - near])
+    np.testing.assert_allclose(spectral_norm(stack),
+                               np.linalg.norm(stack, 2, axis=(-2, -1)),
+                               rtol=1e-12)
+
+
+def test_error_distance_batch():
+    """ """
+    np.random.seed(3)
+    for dim in [2, 3, 4]:
+        target = np.linalg.qr(np.random.rand(dim, dim)
+                              + 1j * np.random.rand(dim, dim))[0]
+        # independent random candidates
+        stack = [np.linalg.qr(np.random.rand(dim, dim)
+                              + 1j * np.random.rand(dim, dim))[0]
+                 for _ in range(30)]
+        # candidates close to target, up to global phases
+        stack += [np.linalg.qr(target + 0.2 * np.random.rand(dim, dim))[0]
+                  * np.exp(2j * np.pi * np.random.rand())
+                  for _ in range(5)]
+        stack = np.array(stack + [target * 1j])
+        # leaked (non-unitary) candidates
+        stack[1] *= 0.9
+        stack[31] *= 0.9
+        distances = error_distance_batch(stack, target)
+        assert distances.shape == (36,)
+        np.testing.assert_allclose(
+            distances, [reference_error_distance(candidate, target)
+                        for candidate in stack], rtol=1e-8, atol=1e-8)
+        np.testing.assert_allclose(
+            distances, [error_distance(candidate, target)
+                        for candidate in stack], rtol=1e-10, atol=1e-10)
+        assert np.isclose(distances[-1], 0, atol=1e-8)
+
+
+def test_leakage_error_batch():
+    """ """
+    for dim in range(2, 5):
+        stack = (np.random.rand(5, dim, dim)
+                 + 1j * np.random.rand(5, dim, dim))
+        expected = [1 - np.linalg.svd(matrix, compute_uv=False)[-1]
+                    for matrix in stack]
+        np.testing.assert_allclose(leakage_error_batch(stack), expected,
+                                   rtol=1e-8, atol=1e-8)
+
+    stack = np.array([random_special_unitary() for _ in range(4)])
+    np.testing.assert_allclose(leakage_error_batch(stack), 0, atol=1e-10)
+    targets = stack[::-1] * np.exp(0.7j)
+    np.testing.assert_allclose(
+        error_distance_batch(stack, targets),
+        [reference_error_distance(candidate, target)
+         for candidate, target in zip(stack, targets)],
+        rtol=1e-8, atol=1e-8)
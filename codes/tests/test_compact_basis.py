@@ -0,0 +1,44 @@
+import pickle
+import numpy as np
+from codes.braiding_generators.compact_basis import (
+    state_to_labels,
+    labels_to_state,
+    encode,
+    decode,
+    CompactBasis
+)
+import codes.braiding_generators.fib_multi_qudits as fib_multi
+import codes.braiding_generators.ising_multi_qudits as ising_multi
+
+
+def test_labels():
+    """ """
+    state = {'qudits': [[1, 0, 1], [0, 1, 0]], 'roots': [1]}
+    assert state_to_labels(state) == [1, 0, 1, 0, 1, 0, 1]
+    assert labels_to_state([1, 0, 1, 0, 1, 0, 1], 2, 3) == state
+
+
+def test_encode():
+    """ """
+    assert encode([1, 0, 2]) == 1 + 2 * 16
+    assert decode(encode([1, 0, 2]), 3) == [1, 0, 2]
+    for _ in range(3):
+        labels = list(np.random.randint(3, size=15))
+        assert decode(encode(labels), 15) == labels
+
+
+def test_compact_basis():
+    """ """
+    for module in [fib_multi, ising_multi]:
+        basis = module.find_basis(3, 3)
+        compact = CompactBasis.from_basis(basis)
+
+        assert len(compact) == len(basis)
+        assert compact.labels.dtype == np.uint8
+        assert compact.to_basis() == basis
+        for row, state in enumerate(basis):
+            assert state in compact
+            assert compact.position(state) == row
+            assert compact[row] == state
+
+        assert pickle.loads(pickle.dumps(compact)) == compact
@@ -1,8 +1,12 @@
 import numpy as np
+from codes.braid_matrix_calculator import get_matrix
+from itertools import product
+from codes.braiding_generators.fib_qudit import F, B
 from codes.braiding_generators.fib_multi_qudits import (
     check_state,
     find_basis,
-    braiding_generator
+    braiding_generator,
+    L
     )
 
 
@@ -39,6 +43,23 @@ def test_find_basis():
         )
 
 
+def test_find_basis_order():
+    """ """
+    # same states, in the same order, as the binary enumeration
+    for nb_qudits, qudit_len in [(1, 3), (2, 2), (2, 3), (3, 2)]:
+        n_labels = nb_qudits * qudit_len + nb_qudits - 1
+        expected = []
+        for comb in product([0, 1], repeat=n_labels):
+            labels = comb[::-1]
+            state = {'qudits': [[labels[ii * nb_qudits + jj]
+                                 for ii in range(qudit_len)]
+                                for jj in range(nb_qudits)],
+                     'roots': list(labels[nb_qudits * qudit_len:])}
+            if check_state(state):
+                expected.append(state)
+        assert find_basis(nb_qudits, qudit_len) == expected
+
+
 def test_braiding_generator():
     """ """
     nb_anyons_per_qubit = 4
@@ -60,3 +81,56 @@ def test_braiding_generator():
             sigmas[index+1] @ sigmas[index] @ sigmas[index+1],
             rtol=1e-5, atol=1e-5
         )
+
+
+def test_braiding_generator_sparse():
+    """ """
+    seq = {"sigma": [1, 3, 2, 5, 4, 2], "power": [1, -1, 1, 1, -1, -1]}
+    dense_sigmas = {}
+    sparse_sigmas = {}
+    for index in range(1, 6):
+        dense = braiding_generator(index, 2, 2, show=False)[0]
+        sparse = braiding_generator(index, 2, 2, show=False, sparse=True)[0]
+        assert sparse.nnz < dense.size
+        np.testing.assert_allclose(sparse.toarray(), dense,
+                                   rtol=1e-10, atol=1e-10)
+
+        dense_sigmas[index] = {1: dense, -1: dense.conjugate().T}
+        sparse_sigmas[index] = {1: sparse, -1: sparse.conjugate().T}
+
+    np.testing.assert_allclose(get_matrix(seq, sigma=sparse_sigmas),
+                               get_matrix(seq, sigma=dense_sigmas),
+                               rtol=1e-10, atol=1e-10)
+
+
+def test_l():
+    """ """
+    # chain contraction agrees with the sum over all intermediate labels
+    labels = [0, 1]
+    for jj_, jj in [([0, 1, 1], [1, 0, 1]), ([1, 1, 1], [1, 1, 0]),
+                    ([1, 0, 1], [1, 0, 1])]:
+        for k, h, i_, i in product(labels, repeat=4):
+            expected = 0
+            for pp in product(labels, repeat=len(jj)):
+                pp = list(pp) + [k]
+                product_ = B(h, 1, 1, pp[0])[i, i_]
+                for ii in range(len(jj)):
+                    product_ *= (
+                        F(i, ([1] + jj)[ii], 1, pp[ii + 1]).conjugate().T[
+                            ([1] + jj)[ii + 1], pp[ii]]
+                        * F(i_, ([1] + jj_)[ii], 1, pp[ii + 1])[
+                            pp[ii], ([1] + jj_)[ii + 1]]
+                    )
+                expected += product_
+            assert np.isclose(L(k, h, i_, i, jj_, jj), expected,
+                              rtol=1e-10, atol=1e-10)
+
+
+def test_braiding_generator_inverse():
+    """ """
+    for index in range(1, 5):
+        sigma_ = np.array(braiding_generator(index, 2, 2, show=False)[0])
+        inverse = np.array(braiding_generator(index, 2, 2, show=False,
+                                              inverse=True)[0])
+        np.testing.assert_allclose(inverse @ sigma_, np.eye(len(sigma_)),
+                                   rtol=1e-10, atol=1e-10)
@@ -0,0 +1,116 @@
+import os
+import json
+import pickle
+import numpy as np
+from codes.braid_matrix_calculator import get_matrix
+from codes.braiding_generators.generator_cache import (
+    register_dir,
+    register_key,
+    build_generators,
+    save_generators,
+    get_generators
+)
+import codes.braiding_generators.fib_multi_qudits as fib_multi
+import codes.braiding_generators.ising_multi_qudits as ising_multi
+
+
+def test_get_generators(tmp_path):
+    """ """
+    SIG, basis = get_generators("fibonacci", 2, 2, cache_dir=str(tmp_path))
+    path = register_dir("fibonacci", 2, 2, cache_dir=str(tmp_path))
+    assert os.path.isfile(os.path.join(path, "manifest.json"))
+    assert not [name for name in os.listdir(path) if "inv" in name]
+    assert basis == fib_multi.find_basis(2, 2)
+    assert sorted(SIG) == [1, 2, 3, 4, 5]
+
+    for n in SIG:
+        gen = fib_multi.braiding_generator(n, 2, 2, show=False)[0]
+        assert isinstance(SIG[n][1], np.memmap)
+        np.testing.assert_allclose(SIG[n][1], gen, rtol=1e-10, atol=1e-10)
+        np.testing.assert_allclose(SIG[n][-1] @ SIG[n][1], np.eye(len(basis)),
+                                   rtol=1e-10, atol=1e-10)
+
+    # second call reads the cache
+    SIG_2, basis_2 = get_generators("fibonacci", 2, 2,
+                                    cache_dir=str(tmp_path), mmap=False)
+    assert basis_2 == basis
+    for n in SIG:
+        np.testing.assert_array_equal(SIG_2[n][1], SIG[n][1])
+
+    assert register_dir("ising", 2, 2, cache_dir=str(tmp_path)) != path
+
+
+def test_stale_cache(tmp_path):
+    """ """
+    path = register_dir("ising", 2, 2, cache_dir=str(tmp_path))
+    os.makedirs(path)
+    with open(os.path.join(path, "manifest.json"), "w") as file:
+        json.dump({"key": {"version": -1}}, file)
+
+    SIG, basis = get_generators("ising", 2, 2, cache_dir=str(tmp_path))
+    assert len(basis) == 8
+    with open(os.path.join(path, "manifest.json")) as file:
+        assert json.load(file)["key"] == register_key("ising", 2, 2)
+
+
+def test_concurrent_save(tmp_path):
+    """ """
+    path = register_dir("fibonacci", 2, 2, cache_dir=str(tmp_path))
+    key = register_key("fibonacci", 2, 2)
+    sigma, compact_basis = build_generators("fibonacci", 2, 2)
+
+    assert save_generators(path, key, sigma, compact_basis)
+    # a second writer leaves the stored generators untouched
+    assert not save_generators(path, key, sigma, compact_basis)
+    assert os.listdir(str(tmp_path)) == [os.path.basename(path)]
+
+
+def test_generator_store(tmp_path):
+    """ """
+    SIG, basis = get_generators("fibonacci", 2, 2, cache_dir=str(tmp_path))
+    assert SIG.loaded() == []
+
+    seq = {"sigma": [3, 4, 3], "power": [1, -1, 1]}
+    w = get_matrix(seq, sigma=SIG)
+    assert SIG.loaded() == [3, 4]
+
+    expected = np.eye(len(basis))
+    for index, power in zip(seq["sigma"], seq["power"]):
+        gen = fib_multi.braiding_generator(index, 2, 2, show=False)[0]
+        expected = (gen if power == 1 else np.linalg.inv(gen)) @ expected
+    np.testing.assert_allclose(w, expected, rtol=1e-10, atol=1e-10)
+
+    # a pickled store reopens the same files
+    SIG_2 = pickle.loads(pickle.dumps(SIG))
+    assert SIG_2.loaded() == [] and SIG_2.path == SIG.path
+
+    # sparse storage
+    SIG_sparse, _ = get_generators("fibonacci", 2, 2,
+                                   cache_dir=str(tmp_path), sparse=True)
+    assert os.path.isfile(os.path.join(
+        register_dir("fibonacci", 2, 2, str(tmp_path), sparse=True),
+        "sigma_1.npz"))
+    np.testing.assert_allclose(get_matrix(seq, sigma=SIG_sparse), w,
+                               rtol=1e-10, atol=1e-10)
+
+
+def test_get_generators_workers(tmp_path):
+    """ """
+    SIG, basis = get_generators("ising", 2, 2, cache_dir=str(tmp_path),
+                                workers=2)
+    assert basis == ising_multi.find_basis(2, 2)
+    for n in SIG:
+        gen = ising_multi.braiding_generator(n, 2, 2, show=False)[0]
+        np.testing.assert_allclose(SIG[n][1], gen, rtol=1e-10, atol=1e-10)
+
+
+def test_lazy_inverse(tmp_path):
+    """ """
+    SIG, _ = get_generators("fibonacci", 2, 2, cache_dir=str(tmp_path))
+    gen = SIG[2][1]
+    assert isinstance(gen, np.memmap)
+    assert -1 not in SIG[2]._powers
+    assert sorted(SIG[2]) == [-1, 1]
+
+    np.testing.assert_allclose(SIG[2][-1], gen.conjugate().T)
+    assert SIG[2][-1] is SIG[2][-1]
@@ -1,8 +1,11 @@
 import numpy as np
+from itertools import product
+from codes.braiding_generators.ising_qudit import F, B
 from codes.braiding_generators.ising_multi_qudits import (
     check_state,
     find_basis,
-    braiding_generator
+    braiding_generator,
+    L
     )
 
 import codes.braiding_generators.ising_qudit as ising
@@ -35,6 +38,24 @@ def test_find_basis_consistency():
             )
 
 
+def test_find_basis_order():
+    """ """
+    # same states, in the same order, as the ternary enumeration
+    for nb_qudits, qudit_len in [(1, 3), (2, 2), (2, 3), (3, 2)]:
+        n_labels = nb_qudits * qudit_len + nb_qudits - 1
+        expected = []
+        for comb in product([0, 1, 2], repeat=n_labels):
+            labels = list(comb[::-1])
+            state = {'qudits': [labels[jj * qudit_len:(jj + 1) * qudit_len]
+                                for jj in range(nb_qudits)],
+                     'roots': labels[nb_qudits * qudit_len:]}
+            if check_state(state):
+                expected.append(state)
+        assert find_basis(nb_qudits, qudit_len) == expected
+
+    assert len(find_basis(6, 3)) == 2**12
+
+
 def test_braiding_generator():
     """ """
     nb_anyons_per_qubit = 4
@@ -56,3 +77,36 @@ def test_braiding_generator():
             sigmas[index+1] @ sigmas[index] @ sigmas[index+1],
             rtol=1e-5, atol=1e-5
         )
+
+
+def test_braiding_generator_sparse():
+    """ """
+    for index in range(1, 6):
+        dense = braiding_generator(index, 2, 2, show=False)[0]
+        sparse = braiding_generator(index, 2, 2, show=False, sparse=True)[0]
+        assert sparse.nnz < dense.size
+        np.testing.assert_allclose(sparse.toarray(), dense,
+                                   rtol=1e-10, atol=1e-10)
+
+
+def test_l():
+    """ """
+    # chain contraction agrees with the sum over all intermediate labels
+    labels = [0, 1, 2]
+    for jj_, jj in [([0, 1, 1], [1, 0, 1]), ([1, 1, 1], [1, 1, 0]),
+                    ([1, 0, 1], [1, 0, 1])]:
+        for k, h, i_, i in product(labels, repeat=4):
+            expected = 0
+            for pp in product(labels, repeat=len(jj)):
+                pp = list(pp) + [k]
+                product_ = B(h, 1, 1, pp[0])[i, i_]
+                for ii in range(len(jj)):
+                    product_ *= (
+                        F(i, ([1] + jj)[ii], 1, pp[ii + 1]).conjugate().T[
+                            ([1] + jj)[ii + 1], pp[ii]]
+                        * F(i_, ([1] + jj_)[ii], 1, pp[ii + 1])[
+                            pp[ii], ([1] + jj_)[ii + 1]]
+                    )
+                expected += product_
+            assert np.isclose(L(k, h, i_, i, jj_, jj), expected,
+                              rtol=1e-10, atol=1e-10)
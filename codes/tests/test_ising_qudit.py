@@ -1,12 +1,17 @@
 import numpy as np
+from itertools import product
 from braiding_generators.ising_qudit import (
     F,
     R,
     check_rule,
     check_state,
     find_basis,
+    iter_basis,
     iterate,
     B,
+    F_elem,
+    R_elem,
+    B_elem,
     sigma,
     braiding_generator,
 )
@@ -91,6 +96,19 @@ def test_find_basis():
                       [0, 1, 2], [2, 1, 2]] for _ in find_basis(4)])
 
 
+def test_iter_basis():
+    """ """
+    # same states, in the same order, as the ternary enumeration
+    for nb_anyons in range(1, 9):
+        expected = [list(comb[::-1])
+                    for comb in product([0, 1, 2], repeat=nb_anyons - 1)
+                    if check_state(list(comb[::-1]))]
+        assert list(iter_basis(nb_anyons)) == expected
+        assert find_basis(nb_anyons) == expected
+
+    assert len(find_basis(24)) == 2**12
+
+
 def test_iterate():
     """ """
     nb_labels = np.random.randint(2, 5)
@@ -117,6 +135,19 @@ def test_b():
                                )
 
 
+def test_symbol_tables():
+    """ """
+    labels = [0, 1, 2]
+    for a0, a1, a2, a3 in product(labels, repeat=4):
+        f_matrix = F(a0, a1, a2, a3)
+        b_matrix = B(a0, a1, a2, a3)
+        r_matrix = R(a0, a1)
+        for i, j in product(range(len(labels)), repeat=2):
+            assert np.isclose(F_elem(a0, a1, a2, a3, i, j), f_matrix[i, j])
+            assert np.isclose(B_elem(a0, a1, a2, a3, i, j), b_matrix[i, j])
+            assert np.isclose(R_elem(a0, a1, i, j), r_matrix[i, j])
+
+
 def test_sigma():
     """ """
     assert np.isclose(sigma(1, [0, 1, 2, 1], [0, 1, 2, 1]),
@@ -161,3 +192,19 @@ def test_braiding_generator():
             sigmas[index+1] @ sigmas[index] @ sigmas[index+1],
             rtol=1e-5, atol=1e-5
         )
+
+
+def test_braiding_generator_blocks():
+    """ """
+    # block construction agrees with the amplitudes of sigma
+    for nb_anyons in range(2, 7):
+        basis = find_basis(nb_anyons)
+        for index in range(1, nb_anyons):
+            sigma_, _ = braiding_generator(index, nb_anyons, False)
+            assert isinstance(sigma_, np.ndarray)
+            np.testing.assert_allclose(
+                sigma_,
+                np.array([[sigma(index, state_f, state_i)
+                           for state_i in basis] for state_f in basis],
+                         dtype=complex),
+                rtol=1e-10, atol=1e-10)
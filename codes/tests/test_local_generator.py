@@ -0,0 +1,79 @@
+import numpy as np
+from codes.braid_matrix_calculator import get_matrix
+from codes.braiding_generators.basis_index import get_basis_index
+from codes.braiding_generators.local_generator import LocalGenerator
+import codes.braiding_generators.fib_multi_qudits as fib_multi
+import codes.braiding_generators.ising_multi_qudits as ising_multi
+
+
+def test_local_generator():
+    """ """
+    for module in [fib_multi, ising_multi]:
+        for index in range(1, 8):
+            dense = module.braiding_generator(index, 2, 3, show=False)[0]
+            local = module.braiding_generator(index, 2, 3, show=False,
+                                              local=True)[0]
+            assert max(rows.shape[1] for rows, _ in local.parts) < len(dense)
+            np.testing.assert_allclose(local.toarray(), dense,
+                                       rtol=1e-10, atol=1e-10)
+            np.testing.assert_allclose(local.inverse().toarray(),
+                                       dense.conjugate().T,
+                                       rtol=1e-10, atol=1e-10)
+
+            states = np.random.rand(len(dense), 3)
+            np.testing.assert_allclose(local @ states, dense @ states,
+                                       rtol=1e-10, atol=1e-10)
+            np.testing.assert_allclose(local @ states[:, 0],
+                                       dense @ states[:, 0],
+                                       rtol=1e-10, atol=1e-10)
+            np.testing.assert_allclose((local @ local).toarray(),
+                                       dense @ dense,
+                                       rtol=1e-10, atol=1e-10)
+
+
+def test_from_matrix():
+    """ """
+    basis_index = get_basis_index("fibonacci", 2, 2)
+    dense = fib_multi.braiding_generator(3, 2, 2, show=False)[0]
+    local = LocalGenerator.from_matrix(dense, basis_index.coupled_rows(3))
+    np.testing.assert_allclose(local.toarray(), dense, rtol=1e-10, atol=1e-10)
+
+
+def test_get_matrix_local():
+    """ """
+    dense_sigmas = {}
+    local_sigmas = {}
+    for index in range(1, 8):
+        dense = fib_multi.braiding_generator(index, 2, 3, show=False)[0]
+        local = fib_multi.braiding_generator(index, 2, 3, show=False,
+                                             local=True)[0]
+        dense_sigmas[index] = {1: dense, -1: dense.conjugate().T}
+        local_sigmas[index] = {1: local, -1: local.inverse()}
+
+    seq = {"sigma": list(np.random.randint(1, 8, size=30)),
+           "power": list(np.random.choice([-1, 1], size=30))}
+    expected = get_matrix(seq, dense_sigmas)
+    np.testing.assert_allclose(get_matrix(seq, local_sigmas), expected,
+                               rtol=1e-10, atol=1e-10)
+    np.testing.assert_allclose(get_matrix(seq, local_sigmas, layered=True),
+                               expected, rtol=1e-10, atol=1e-10)
+
+
+def test_compose():
+    """ """
+    generators = {index: fib_multi.braiding_generator(index, 2, 3, show=False,
+                                                      local=True)[0]
+                  for index in range(1, 8)}
+    dim = generators[1].dim
+    for first, second in [(1, 3), (2, 6), (3, 4), (5, 7)]:
+        product = generators[first] @ generators[second]
+        assert isinstance(product, LocalGenerator)
+        np.testing.assert_allclose(
+            product.toarray(),
+            generators[first].toarray() @ generators[second].toarray(),
+            rtol=1e-10, atol=1e-10)
+        np.testing.assert_allclose(np.asarray(product), product.toarray())
+
+    # commuting generators on different labels keep small blocks
+    layer = generators[1] @ generators[3] @ generators[6]
+    assert max(rows.shape[1] for rows, _ in layer.parts) < dim
@@ -0,0 +1,49 @@
+import numpy as np
+import codes.braiding_generators.parallel_build as parallel_build
+from codes.braiding_generators.parallel_build import (
+    split_groups,
+    build_all_generators,
+)
+from codes.braiding_generators.generator_cache import build_generators
+
+
+def test_split_groups():
+    """ """
+    groups = [[0], [1, 2], [3, 4, 5], [6], [7, 8]]
+    chunks = split_groups(groups, chunk_size=5)
+    assert [group for chunk in chunks for group in chunk] == groups
+    assert chunks == [[[0], [1, 2]], [[3, 4, 5]], [[6], [7, 8]]]
+    assert split_groups(groups, chunk_size=1000) == [groups]
+
+
+def test_build_all_generators():
+    """ """
+    for model, n_qudits, qudit_len in [("fibonacci", 2, 2), ("ising", 2, 2),
+                                       ("fibonacci", 3, 2)]:
+        sigma, compact_basis = build_generators(model, n_qudits, qudit_len)
+        for workers, sparse in [(1, False), (2, False), (2, True)]:
+            parallel, parallel_basis = build_all_generators(
+                model, n_qudits, qudit_len, workers=workers, sparse=sparse,
+                chunk_size=10)
+            assert parallel_basis == compact_basis
+            assert sorted(parallel) == sorted(sigma)
+            for n in sigma:
+                for power in [1, -1]:
+                    gen = parallel[n][power]
+                    np.testing.assert_allclose(
+                        gen.toarray() if sparse else gen, sigma[n][power],
+                        rtol=1e-12, atol=1e-12)
+
+
+def test_workers_none(monkeypatch):
+    """ """
+    def no_pool(*args, **kwargs):
+        raise AssertionError("workers=None should not start a pool")
+
+    monkeypatch.setattr(parallel_build, "ProcessPoolExecutor", no_pool)
+    sigma, compact_basis = build_generators("fibonacci", 2, 2)
+    serial, serial_basis = build_all_generators("fibonacci", 2, 2)
+    assert serial_basis == compact_basis
+    for n in sigma:
+        np.testing.assert_allclose(serial[n][1], sigma[n][1],
+                                   rtol=1e-12, atol=1e-12)
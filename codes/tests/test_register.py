@@ -0,0 +1,63 @@
+import pickle
+import numpy as np
+import codes.braiding_generators.fib_multi_qudits as fib_multi
+import codes.braiding_generators.ising_multi_qudits as ising_multi
+from codes.braiding_generators.register import Register, get_register
+
+
+def test_register():
+    """ """
+    register = Register("fibonacci", 2, 2)
+    assert register.n_anyons == 6
+    assert register.basis == fib_multi.find_basis(2, 2)
+    assert len(register) == len(register.basis)
+
+    # groups are computed once per index
+    assert register.coupled_states(3) is register.coupled_states(3)
+
+    assert get_register("ising", 2, 2) is get_register("ising", 2, 2)
+
+
+def test_generators():
+    """ """
+    for model, module in [("fibonacci", fib_multi), ("ising", ising_multi)]:
+        register = Register(model, 2, 2)
+        SIG = register.generators()
+        assert sorted(SIG) == list(range(1, register.n_anyons))
+        for n in SIG:
+            gen = module.braiding_generator(n, 2, 2, show=False)[0]
+            np.testing.assert_allclose(register.generator(n), gen,
+                                       rtol=1e-12, atol=1e-12)
+            np.testing.assert_allclose(SIG[n][1], gen,
+                                       rtol=1e-12, atol=1e-12)
+            np.testing.assert_allclose(SIG[n][-1], gen.conjugate().T,
+                                       rtol=1e-12, atol=1e-12)
+            np.testing.assert_allclose(
+                register.generator(n, sparse=True).toarray(), gen,
+                rtol=1e-12, atol=1e-12)
+
+        # worker processes build their register from the shared labels
+        parallel = register.generators(workers=2)
+        for n in SIG:
+            np.testing.assert_allclose(parallel[n][1], SIG[n][1],
+                                       rtol=1e-12, atol=1e-12)
+
+
+def test_basis_copy():
+    """ """
+    sig, basis = fib_multi.braiding_generator(2, 2, 2, show=False)
+    expected = fib_multi.find_basis(2, 2)
+    basis[0]["qudits"] = None
+    basis.pop()
+    assert get_register("fibonacci", 2, 2).basis == expected
+    assert fib_multi.braiding_generator(2, 2, 2, show=False)[1] == expected
+
+
+def test_pickle():
+    """ """
+    register = Register("ising", 2, 3)
+    unpickled = pickle.loads(pickle.dumps(register))
+    assert len(pickle.dumps(register)) < 200
+    assert unpickled.basis == register.basis
+    np.testing.assert_allclose(unpickled.generator(4), register.generator(4),
+                               rtol=1e-12, atol=1e-12)
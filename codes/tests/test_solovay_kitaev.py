@@ -0,0 +1,60 @@
+import os
+import numpy as np
+from codes.braid_matrix_calculator import get_matrix
+from codes.solovay_kitaev import (
+    special_unitary,
+    table_path,
+    load_base_table,
+    group_commutator,
+    SolovayKitaev,
+    compile_gate,
+)
+from codes.tests.helpers import random_special_unitary, su2_distance
+
+
+def test_base_table(tmp_path):
+    """ """
+    table = load_base_table(3, cache_dir=str(tmp_path))
+    assert os.path.isfile(table_path(3, cache_dir=str(tmp_path)))
+    assert len(table["s0"]) == 1 + 2 * (9 + 9**2 + 9**3)
+
+    compiler = SolovayKitaev(3, cache_dir=str(tmp_path))
+    for key in table:
+        np.testing.assert_array_equal(compiler.table[key], table[key])
+    for row in range(0, len(table["s0"]), 97):
+        seq = compiler.base_seq(row)
+        assert su2_distance(get_matrix(seq), table["unitaries"][row]) < 1e-10
+
+
+def test_group_commutator():
+    """ """
+    for _ in range(5):
+        special = special_unitary(random_special_unitary())
+        v, w = group_commutator(special)
+        assert su2_distance(v @ w @ v.conjugate().T @ w.conjugate().T,
+                            special) < 1e-10
+
+
+def test_compile_gate(tmp_path):
+    """ """
+    np.random.seed(7)
+    for _ in range(3):
+        target = random_special_unitary() * np.exp(0.4j)
+        errors = [su2_distance(get_matrix(compile_gate(
+            target, depth, max_runs=4, cache_dir=str(tmp_path))), target)
+            for depth in range(4)]
+        assert errors[0] < 0.1
+        assert errors[3] < 0.005
+        assert errors[3] < errors[0]
+
+
+def test_compile_real_gate(tmp_path):
+    """ """
+    # real targets with det = -1: Hadamard and X
+    for target in [np.array([[1, 1], [1, -1]]) / np.sqrt(2),
+                   np.array([[0, 1], [1, 0]])]:
+        errors = [su2_distance(get_matrix(compile_gate(
+            target, depth, max_runs=4, cache_dir=str(tmp_path))), target)
+            for depth in range(4)]
+        assert errors[0] < 0.15
+        assert errors[3] < 0.005
@@ -0,0 +1,70 @@
+import pickle
+import numpy as np
+from codes.su2_index import su2_coordinates, SU2Index
+from codes.weave_search import enumerate_weaves, weave_unitaries
+from codes.tests.helpers import random_special_unitary, su2_distance
+
+
+def test_su2_coordinates():
+    """ """
+    weaves = enumerate_weaves(2)
+    stack = weave_unitaries(weaves)
+    points = su2_coordinates(stack)
+    np.testing.assert_allclose(np.linalg.norm(points, axis=1), 1)
+
+    for ii in range(0, len(weaves), 5):
+        for jj in range(0, len(weaves), 3):
+            chord = min(np.linalg.norm(points[ii] - points[jj]),
+                        np.linalg.norm(points[ii] + points[jj]))
+            np.testing.assert_allclose(
+                chord, su2_distance(stack[ii], stack[jj]), atol=1e-10)
+
+
+def test_query():
+    """ """
+    stack = weave_unitaries(enumerate_weaves(3))
+    index = SU2Index(stack)
+    assert len(index) == len(stack)
+
+    targets = np.array([random_special_unitary() * np.exp(1j * phase)
+                        for phase in np.linspace(0, 3, 7)])
+    brute = np.array([[su2_distance(unitary, target)
+                       for unitary in stack] for target in targets])
+
+    distances, rows = index.query(targets)
+    np.testing.assert_allclose(distances, brute.min(axis=1), atol=1e-10)
+    np.testing.assert_allclose(brute[np.arange(len(targets)), rows],
+                               distances, atol=1e-10)
+
+    distances, rows = index.query(targets, k=4)
+    assert rows.shape == (len(targets), 4)
+    np.testing.assert_allclose(distances, np.sort(brute, axis=1)[:, :4],
+                               atol=1e-10)
+    assert all(len(set(row)) == 4 for row in rows)
+
+    for target_brute, (distances, rows) in zip(
+            brute, index.query_radius(targets, 0.5)):
+        np.testing.assert_array_equal(rows,
+                                      np.flatnonzero(target_brute < 0.5))
+        np.testing.assert_allclose(distances, target_brute[rows], atol=1e-10)
+
+    # real targets with det = -1: X, Z and Hadamard
+    targets = np.array([[[0, 1], [1, 0]], [[1, 0], [0, -1]],
+                        [[1, 1], [1, -1]] / np.sqrt(2)])
+    brute = np.array([[su2_distance(unitary, target)
+                       for unitary in stack] for target in targets])
+    distances, rows = index.query(targets)
+    np.testing.assert_allclose(distances, brute.min(axis=1), atol=1e-10)
+
+
+def test_save_load(tmp_path):
+    """ """
+    index = SU2Index(weave_unitaries(enumerate_weaves(2)))
+    path = str(tmp_path / "index.npz")
+    index.save(path)
+    loaded = SU2Index.load(path)
+    np.testing.assert_array_equal(loaded.points, index.points)
+
+    unpickled = pickle.loads(pickle.dumps(index))
+    target = random_special_unitary()
+    assert unpickled.query(target)[1] == index.query(target)[1]
@@ -0,0 +1,37 @@
+import numpy as np
+from codes.braid_matrix_calculator import get_matrix
+from codes.weave_search import (
+    weave_to_seq,
+    enumerate_weaves,
+    search_weaves,
+)
+from codes.tests.helpers import su2_distance
+
+
+def test_weave_to_seq():
+    """ """
+    assert weave_to_seq([2, -4, 2], 1) == {"sigma": [1, 2, 1],
+                                           "power": [2, -4, 2]}
+    assert weave_to_seq([2, -4], 2) == {"sigma": [2, 1], "power": [2, -4]}
+
+
+def test_search_weaves():
+    """ """
+    weave = [2, -4, 2, 2, -2]
+    target = get_matrix(weave_to_seq(weave, 2)) * np.exp(0.3j)
+
+    found = search_weaves(target, 5, 1e-6, s0=2)
+    assert [2, -4, 2, 2, -2] in [found_weave for _, found_weave in found]
+
+    # every weave found is within tol, and none is missed
+    tol = 0.3
+    found = search_weaves(target, 4, tol)
+    errors = {tuple(found_weave): error for error, found_weave in found}
+    for candidate in enumerate_weaves(4):
+        error = su2_distance(get_matrix(weave_to_seq(candidate, 1)),
+                                  target)
+        if error < tol - 1e-9:
+            np.testing.assert_allclose(errors[candidate], error, atol=1e-10)
+        elif error > tol + 1e-9:
+            assert candidate not in errors
+    assert [error for error, _ in found] == sorted(errors.values())
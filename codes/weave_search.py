@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+r"""
+Weave search
+************
+
+'weave_search' module finds weaves approximating a target SU(2) gate on
+three anyons (generators braid_matrix_calculator.EX_SIGMA), as the weaves
+hard-coded in cnot.py and toffoli-decomposition.py.
+
+A weave is a list of even powers applied alternately to sigma_{s0} and to
+the other generator, e.g. [2, -4, 2] with s0 = 1 is
+sigma_1^2 sigma_2^-4 sigma_1^2 (chronology from left to right).
+
+The search is meet-in-the-middle: a weave of length n is split into a
+first half A and a second half B, with matrix B @ A. The unitaries of all
+the first halves are indexed in an SU2Index (k-d tree over SU(2)),
+and each second half B only queries the neighbourhood of B^dagger @ target,
+since error_distance(B @ A, target) = error_distance(A, B^dagger @ target).
+Enumerating 2 * |powers|^(n/2) halves replaces |powers|^n weaves.
+"""
+import itertools
+from typing import Dict, List, Tuple
+from codes.braid_matrix_calculator import EX_SIGMA, get_matrix_batch
+from codes.su2_index import SU2Index
+
+WEAVE_POWERS = (-4, -2, 2, 4)
+
+
+def weave_to_seq(weave: List[int], s0=1) -> Dict:
+    """
+    braid seq of a weave on three anyons.
+
+    Inputs:
+        weave: List[int]:
+            powers, applied alternately to sigma_{s0} and the other sigma.
+        s0: int:
+            first sigma index, 1 or 2.
+    Returns:
+        dict: 'sigma' and 'power' lists, chronology from left to right.
+    """
+    sigma = []
+    for ii in range(len(weave)):
+        sigma.append(s0 if ii % 2 == 0 else 3 - s0)
+
+    return {"sigma": sigma, "power": list(weave)}
+
+
+def enumerate_weaves(length, powers=WEAVE_POWERS) -> List[Tuple[int, ...]]:
+    """
+    all the weaves of a given length with powers in powers.
+    """
+    return list(itertools.product(powers, repeat=length))
+
+
+def weave_unitaries(weaves, s0=1, sigma=0) -> "np.ndarray":
+    """
+    (N, 2, 2) stack of the matrix representations of weaves.
+    """
+    if sigma == 0:
+        sigma = EX_SIGMA
+
+    return get_matrix_batch([weave_to_seq(weave, s0) for weave in weaves],
+                            sigma)
+
+
+def search_weaves(target: "np.ndarray", length, tol, powers=WEAVE_POWERS,
+                  s0=1, sigma=0, max_results=None
+                  ) -> List[Tuple[float, List[int]]]:
+    """
+    weaves of a given length whose error distance to target is below tol.
+
+    Inputs:
+        target: numpy.array:
+            2x2 unitary, defined up to a global phase.
+        length: int:
+            number of powers of the weaves.
+        tol: float:
+            maximal error distance.
+        powers: tuple:
+            powers allowed in the weaves.
+        s0: int:
+            first sigma index, 1 or 2.
+        sigma: dict:
+            sigma[index][power] 2x2 generators (default EX_SIGMA).
+        max_results: int:
+            keep only the best weaves.
+    Returns:
+        List[(float, List[int])]: (error distance, weave), best first.
+    """
+    if length < 2:
+        raise ValueError("The weave should include at least 2 powers!")
+
+    first_len = length // 2
+    first_weaves = enumerate_weaves(first_len, powers)
+    second_weaves = enumerate_weaves(length - first_len, powers)
+    second_s0 = s0 if first_len % 2 == 0 else 3 - s0
+
+    first_index = SU2Index(weave_unitaries(first_weaves, s0, sigma))
+    second_unitaries = weave_unitaries(second_weaves, second_s0, sigma)
+
+    # B^dagger @ target, the unitaries the first halves should match
+    queries = second_unitaries.conjugate().transpose(0, 2, 1) @ target
+
+    results = {}
+    for second, (errors, rows) in enumerate(
+            first_index.query_radius(queries, tol)):
+        for error, row in zip(errors, rows):
+            results[first_weaves[row] + second_weaves[second]] = error
+
+    found = sorted((float(error), list(weave))
+                   for weave, error in results.items())
+
+    return found[:max_results]